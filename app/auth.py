@@ -5,17 +5,23 @@ Provides user authentication and role-based access control.
 """
 
 import hashlib
+import hmac
 import streamlit as st
-from typing import Optional, Dict, Tuple
+from typing import Optional, Tuple
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntFlag
 
 
-class UserRole(Enum):
-    """User roles with access levels."""
-    DOCTOR = "doctor"
-    PHARMACIST = "pharmacist"
-    ADMIN = "admin"
+class UserRole(IntFlag):
+    """User roles as bit flags so permission sets are single masks."""
+    DOCTOR = 1
+    PHARMACIST = 2
+    ADMIN = 4
+
+
+# Permission masks
+CAN_PREDICT = UserRole.DOCTOR | UserRole.PHARMACIST | UserRole.ADMIN
+CAN_VIEW_LOGS = UserRole.ADMIN
 
 
 @dataclass
@@ -29,46 +35,46 @@ class User:
         return self.role == UserRole.ADMIN
     
     def can_view_logs(self) -> bool:
-        return self.role == UserRole.ADMIN
+        return bool(self.role & CAN_VIEW_LOGS)
     
     def can_make_predictions(self) -> bool:
-        return self.role in [UserRole.DOCTOR, UserRole.PHARMACIST, UserRole.ADMIN]
+        return bool(self.role & CAN_PREDICT)
 
 
-def hash_password(password: str) -> str:
-    """Hash a password using SHA-256."""
-    return hashlib.sha256(password.encode()).hexdigest()
+def hash_password(password: str) -> bytes:
+    """Hash a password using SHA-256, returning the raw 32-byte digest."""
+    return hashlib.sha256(password.encode()).digest()
 
 
 # Demo users for the system
 # In production, this would be replaced with a database or LDAP integration
-DEMO_USERS = {
-    "doctor1": {
-        "password_hash": hash_password("doctor123"),
-        "name": "Dr. Sarah Smith",
-        "role": UserRole.DOCTOR
-    },
-    "doctor2": {
-        "password_hash": hash_password("doctor123"),
-        "name": "Dr. James Wilson",
-        "role": UserRole.DOCTOR
-    },
-    "pharmacist1": {
-        "password_hash": hash_password("pharma123"),
-        "name": "John Doe, PharmD",
-        "role": UserRole.PHARMACIST
-    },
-    "pharmacist2": {
-        "password_hash": hash_password("pharma123"),
-        "name": "Emily Chen, PharmD",
-        "role": UserRole.PHARMACIST
-    },
-    "admin": {
-        "password_hash": hash_password("admin123"),
-        "name": "System Administrator",
-        "role": UserRole.ADMIN
-    }
-}
+# Stored as parallel tuples indexed through _USER_INDEX; hashes are computed once at import.
+_USERNAMES = ("doctor1", "doctor2", "pharmacist1", "pharmacist2", "admin")
+_HASHES = tuple(hash_password(p) for p in (
+    "doctor123",
+    "doctor123",
+    "pharma123",
+    "pharma123",
+    "admin123"
+))
+_NAMES = (
+    "Dr. Sarah Smith",
+    "Dr. James Wilson",
+    "John Doe, PharmD",
+    "Emily Chen, PharmD",
+    "System Administrator"
+)
+_ROLES = (
+    UserRole.DOCTOR,
+    UserRole.DOCTOR,
+    UserRole.PHARMACIST,
+    UserRole.PHARMACIST,
+    UserRole.ADMIN
+)
+_USER_INDEX = {username: i for i, username in enumerate(_USERNAMES)}
+
+# Compared against for unknown usernames so both paths hash and compare
+_DUMMY_HASH = hashlib.sha256(b"no-such-user").digest()
 
 
 def authenticate(username: str, password: str) -> Tuple[bool, Optional[User]]:
@@ -82,19 +88,19 @@ def authenticate(username: str, password: str) -> Tuple[bool, Optional[User]]:
     Returns:
         Tuple of (success, User object or None)
     """
-    if username not in DEMO_USERS:
-        return False, None
-    
-    user_data = DEMO_USERS[username]
+    i = _USER_INDEX.get(username)
     password_hash = hash_password(password)
+    stored_hash = _DUMMY_HASH if i is None else _HASHES[i]
     
-    if password_hash != user_data["password_hash"]:
+    # Always run the comparison so unknown users take the same path
+    matched = hmac.compare_digest(password_hash, stored_hash)
+    if not (matched & (i is not None)):
         return False, None
     
     user = User(
         username=username,
-        name=user_data["name"],
-        role=user_data["role"]
+        name=_NAMES[i],
+        role=_ROLES[i]
     )
     
     return True, user
@@ -119,6 +125,12 @@ def logout_user() -> None:
         st.session_state.last_assessment = None
 
 
+def _auth_snapshot() -> Tuple[bool, Optional[User]]:
+    """Read authentication flag and current user from session state in one pass."""
+    ss = st.session_state
+    return ss.get('authenticated', False), ss.get('user', None)
+
+
 def is_authenticated() -> bool:
     """Check if user is currently authenticated."""
     return st.session_state.get('authenticated', False)
@@ -132,19 +144,20 @@ def get_current_user() -> Optional[User]:
 def require_auth(func):
     """Decorator to require authentication for a function."""
     def wrapper(*args, **kwargs):
-        if not is_authenticated():
+        authenticated, _ = _auth_snapshot()
+        if not authenticated:
             st.warning("⚠️ Please login to access this feature.")
             return None
         return func(*args, **kwargs)
     return wrapper
 
 
-def require_role(allowed_roles: list):
-    """Decorator to require specific roles for a function."""
+def require_role(mask: UserRole):
+    """Decorator to require one of the roles in a UserRole mask for a function."""
     def decorator(func):
         def wrapper(*args, **kwargs):
-            user = get_current_user()
-            if not user or user.role not in allowed_roles:
+            authenticated, user = _auth_snapshot()
+            if not authenticated or not user or not (user.role & mask):
                 st.error("🚫 You don't have permission to access this feature.")
                 return None
             return func(*args, **kwargs)
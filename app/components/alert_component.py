@@ -6,59 +6,22 @@ risk severity, implementing alert fatigue reduction.
 """
 
 import streamlit as st
+from types import MappingProxyType
 from typing import Optional, List
-import sys
-from pathlib import Path
+from cdss_config import ALERT_CONFIG
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from cdss_config import RISK_COLORS, ALERT_CONFIG
 
-
-def render_alert(
-    risk_level: str,
-    message: str,
-    confidence: float,
-    recommendations: Optional[List[str]] = None
-) -> None:
-    """
-    Render a clinical alert based on risk level.
-    
-    Args:
-        risk_level: Risk level (Low, Medium, High)
-        message: Alert message to display
-        confidence: Model confidence (0-1)
-        recommendations: Optional list of recommendations
-    """
-    # Check if alert should be shown based on configuration
-    should_show = _should_display_alert(risk_level)
-    
-    if not should_show:
-        return
-    
-    color = RISK_COLORS.get(risk_level, "#6c757d")
-    
-    if risk_level == "High":
-        _render_high_risk_alert(message, confidence, recommendations)
-    elif risk_level == "Medium":
-        _render_medium_risk_alert(message, confidence, recommendations)
-    else:
-        _render_low_risk_alert(message, confidence)
+# Whether an alert is shown for each risk level (unknown levels follow High)
+_SHOW_ALERT = MappingProxyType({
+    'Low': ALERT_CONFIG['show_low_risk'],
+    'Medium': ALERT_CONFIG['show_medium_risk'],
+    'High': ALERT_CONFIG['show_high_risk']
+})
 
 
-def _should_display_alert(risk_level: str) -> bool:
-    """Check if alert should be displayed based on config."""
-    if risk_level == "Low":
-        return ALERT_CONFIG['show_low_risk']
-    elif risk_level == "Medium":
-        return ALERT_CONFIG['show_medium_risk']
-    else:
-        return ALERT_CONFIG['show_high_risk']
-
-
-def _render_high_risk_alert(message: str, confidence: float, recommendations: Optional[List[str]]) -> None:
-    """Render a high-risk critical alert with enhanced animations."""
-    st.markdown("""
-    <style>
+# Animation styles shared by all alert variants, injected once per script run
+_ALERT_CSS = """
+<style>
     @keyframes pulse {
         0% { box-shadow: 0 0 0 0 rgba(220, 53, 69, 0.7); }
         70% { box-shadow: 0 0 0 15px rgba(220, 53, 69, 0); }
@@ -86,9 +49,73 @@ def _render_high_risk_alert(message: str, confidence: float, recommendations: Op
         animation: heartbeat 1.5s infinite;
         display: inline-block;
     }
-    </style>
-    """, unsafe_allow_html=True)
+    @keyframes glowWarning {
+        0%, 100% { box-shadow: 0 0 5px rgba(255, 193, 7, 0.5); }
+        50% { box-shadow: 0 0 20px rgba(255, 193, 7, 0.8), 0 0 30px rgba(255, 193, 7, 0.4); }
+    }
+    .medium-risk-alert {
+        animation: glowWarning 2.5s infinite, fadeIn 0.5s ease-out;
+    }
+    @keyframes successGlow {
+        0% { opacity: 0; transform: scale(0.95); }
+        50% { transform: scale(1.02); }
+        100% { opacity: 1; transform: scale(1); }
+    }
+    .success-alert {
+        animation: successGlow 0.6s ease-out;
+    }
+</style>
+"""
+
+
+def reset_alert_css() -> None:
+    """
+    Mark the alert styles as not yet emitted.
     
+    Call once at the start of every script run; Streamlit drops the previous
+    run's elements, so the styles must be emitted again by the next alert.
+    """
+    st.session_state._alert_css_injected = False
+
+
+def _ensure_alert_css() -> None:
+    """Inject the alert animation styles if not already emitted in this run."""
+    if not st.session_state.get('_alert_css_injected'):
+        st.markdown(_ALERT_CSS, unsafe_allow_html=True)
+        st.session_state._alert_css_injected = True
+
+
+def render_alert(
+    risk_level: str,
+    message: str,
+    confidence: float,
+    recommendations: Optional[List[str]] = None
+) -> None:
+    """
+    Render a clinical alert based on risk level.
+    
+    Args:
+        risk_level: Risk level (Low, Medium, High)
+        message: Alert message to display
+        confidence: Model confidence (0-1)
+        recommendations: Optional list of recommendations
+    """
+    # Check if alert should be shown based on configuration
+    if not _SHOW_ALERT.get(risk_level, ALERT_CONFIG['show_high_risk']):
+        return
+    
+    _ensure_alert_css()
+    
+    if risk_level == "High":
+        _render_high_risk_alert(message, confidence, recommendations)
+    elif risk_level == "Medium":
+        _render_medium_risk_alert(message, confidence, recommendations)
+    else:
+        _render_low_risk_alert(message, confidence)
+
+
+def _render_high_risk_alert(message: str, confidence: float, recommendations: Optional[List[str]]) -> None:
+    """Render a high-risk critical alert with enhanced animations."""
     st.markdown(f"""
     <div class="high-risk-alert" style="
         background: linear-gradient(135deg, rgba(220, 53, 69, 0.15), rgba(220, 53, 69, 0.25));
@@ -151,18 +178,6 @@ def _render_high_risk_alert(message: str, confidence: float, recommendations: Op
 
 def _render_medium_risk_alert(message: str, confidence: float, recommendations: Optional[List[str]]) -> None:
     """Render a medium-risk warning alert."""
-    st.markdown("""
-    <style>
-    @keyframes glowWarning {
-        0%, 100% { box-shadow: 0 0 5px rgba(255, 193, 7, 0.5); }
-        50% { box-shadow: 0 0 20px rgba(255, 193, 7, 0.8), 0 0 30px rgba(255, 193, 7, 0.4); }
-    }
-    .medium-risk-alert {
-        animation: glowWarning 2.5s infinite, fadeIn 0.5s ease-out;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
     st.markdown(f"""
     <div class="medium-risk-alert" style="
         background: linear-gradient(135deg, #ffc10733, #ffc10755);
@@ -201,17 +216,9 @@ def _render_low_risk_alert(message: str, confidence: float) -> None:
 
 def render_no_alert_message() -> None:
     """Render a message when no alert is needed."""
+    _ensure_alert_css()
+    
     st.markdown("""
-    <style>
-    @keyframes successGlow {
-        0% { opacity: 0; transform: scale(0.95); }
-        50% { transform: scale(1.02); }
-        100% { opacity: 1; transform: scale(1); }
-    }
-    .success-alert {
-        animation: successGlow 0.6s ease-out;
-    }
-    </style>
     <div class="success-alert" style="
         background: linear-gradient(135deg, #28a74522, #28a74540);
         border-left: 4px solid #28a745;
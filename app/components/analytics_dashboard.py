@@ -6,14 +6,10 @@ from the SQLite database.
 """
 
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
+import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, TYPE_CHECKING
 
 from app.database.db import (
     get_statistics,
@@ -22,10 +18,110 @@ from app.database.db import (
     get_prediction_trends,
     export_predictions_csv,
     export_predictions_excel,
-    get_total_records
+    get_total_records,
+    get_latest_timestamp
+)
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+
+# Read-only lookup tables shared by the charts and the predictions table
+_RISK_COLORS = MappingProxyType({
+    'Low': '#28a745',
+    'Medium': '#ffc107',
+    'High': '#dc3545'
+})
+_RISK_DEFAULT_COLOR = '#6c757d'
+_RISK_EMOJI = MappingProxyType({
+    'Low': '🟢',
+    'Medium': '🟡',
+    'High': '🔴'
+})
+
+# Gradient card used for each key metric
+_METRIC_CARD_TEMPLATE = """
+<div style="background: linear-gradient(135deg, {grad_a}, {grad_b});
+            padding: 1.5rem; border-radius: 16px; text-align: center;
+            box-shadow: 0 4px 15px {shadow};">
+    <p style="color: rgba(255,255,255,0.8); margin: 0; font-size: 0.9rem;">{label}</p>
+    <h2 style="color: white; margin: 0.5rem 0; font-size: 2.5rem;">{value}</h2>
+    <p style="color: rgba(255,255,255,0.7); margin: 0; font-size: 0.8rem;">{footer}</p>
+</div>
+"""
+
+
+@st.cache_data(ttl=30)
+def _cached_stats() -> Dict[str, Any]:
+    """Cached summary statistics (refreshed every 30 seconds)."""
+    return get_statistics()
+
+
+@st.cache_data(ttl=30)
+def _cached_trends(days: int) -> List[Dict[str, Any]]:
+    """Cached prediction trends for the given number of days."""
+    return get_prediction_trends(days=days)
+
+
+@st.cache_data(ttl=30)
+def _cached_total() -> int:
+    """Cached total number of prediction records."""
+    return get_total_records()
+
+
+@st.cache_data(max_entries=4, ttl=300, show_spinner=False)
+def _cached_excel_export(cache_key: tuple) -> Optional[bytes]:
+    """Excel export of all records, rebuilt only when cache_key changes."""
+    return export_predictions_excel()
+
+
+@st.cache_data(max_entries=4, ttl=300, show_spinner=False)
+def _cached_csv_export(start_date: str, end_date: str, cache_key: tuple) -> bytes:
+    """Encoded CSV export for a date range, rebuilt only when cache_key changes."""
+    return export_predictions_csv(start_date=start_date, end_date=end_date).encode('utf-8')
+
+
+@st.cache_data(ttl=15)
+def _cached_predictions(limit: int, risk_level: Optional[str]) -> List[Dict[str, Any]]:
+    """Cached recent predictions for a given page size and risk filter."""
+    return get_predictions(limit=limit, risk_level=risk_level)
+
+
+# Vitals shown as stored; read as object columns so a NULL does not upcast ints to float
+_VITAL_TEXT_COLUMNS = (
+    'heart_rate', 'blood_pressure_systolic', 'blood_pressure_diastolic', 'oxygen_saturation'
 )
 
 
+def _column_text(vitals: pd.DataFrame, key: str) -> pd.Series:
+    """Render a vital column exactly as stored (str of the raw value, 'None' for NULL)."""
+    return vitals[key].astype(str).fillna('None')
+
+
+@st.cache_data(ttl=15)
+def _format_predictions(predictions: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Format prediction records into a display table."""
+    df = pd.DataFrame(predictions)
+    vitals = pd.DataFrame(predictions, columns=_VITAL_TEXT_COLUMNS, dtype=object)
+    risk_level = df['risk_level'].fillna('')
+    probability = df['risk_probability'].fillna(0)
+    
+    return pd.DataFrame({
+        'Patient ID': df['patient_id'].fillna('').replace('', '-'),
+        'Doctor ID': df['doctor_id'].fillna('').replace('', '-'),
+        'Time': df['timestamp'].fillna('').astype(str).str[:19].replace('', '-'),
+        'Risk': risk_level.map(_RISK_EMOJI).fillna('⚪') + ' ' + risk_level,
+        'Confidence': probability.map('{:.1%}'.format).where(probability != 0, 'N/A'),
+        'HR': _column_text(vitals, 'heart_rate'),
+        'BP': (
+            _column_text(vitals, 'blood_pressure_systolic') + '/'
+            + _column_text(vitals, 'blood_pressure_diastolic')
+        ),
+        'SpO2': _column_text(vitals, 'oxygen_saturation') + '%',
+        'Alert': df['alert_generated'].fillna(0).astype(bool).map({True: '🔔', False: '-'})
+    })
+
+
 def render_analytics_dashboard() -> None:
     """Render the main analytics dashboard."""
     st.header("📊 System Analytics Dashboard")
@@ -34,9 +130,15 @@ def render_analytics_dashboard() -> None:
     All data is anonymized - no patient identifiers are stored.
     """)
     
+    if st.button("🔄 Refresh", key="analytics_refresh"):
+        _cached_stats.clear()
+        _cached_trends.clear()
+        _cached_total.clear()
+        _cached_predictions.clear()
+    
     # Get statistics
     try:
-        stats = get_statistics()
+        stats = _cached_stats()
     except Exception as e:
         st.error(f"Error loading statistics: {e}")
         return
@@ -57,7 +159,8 @@ def render_analytics_dashboard() -> None:
     
     st.divider()
     
-    # Trends chart
+    # Trends, recent predictions and export are fragments: their widgets
+    # rerun only their own section, not the whole dashboard.
     render_prediction_trends_chart()
     
     st.divider()
@@ -75,76 +178,72 @@ def render_key_metrics(stats: Dict[str, Any]) -> None:
     """Render the key metrics cards."""
     st.subheader("📈 Key Metrics")
     
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown("""
-        <div style="background: linear-gradient(135deg, #0077b6, #023e8a);
-                    padding: 1.5rem; border-radius: 16px; text-align: center;
-                    box-shadow: 0 4px 15px rgba(0, 119, 182, 0.3);">
-            <p style="color: rgba(255,255,255,0.8); margin: 0; font-size: 0.9rem;">Total Predictions</p>
-            <h2 style="color: white; margin: 0.5rem 0; font-size: 2.5rem;">{}</h2>
-            <p style="color: rgba(255,255,255,0.7); margin: 0; font-size: 0.8rem;">All time</p>
-        </div>
-        """.format(stats.get('total_predictions', 0)), unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div style="background: linear-gradient(135deg, #28a745, #20c997);
-                    padding: 1.5rem; border-radius: 16px; text-align: center;
-                    box-shadow: 0 4px 15px rgba(40, 167, 69, 0.3);">
-            <p style="color: rgba(255,255,255,0.8); margin: 0; font-size: 0.9rem;">Today's Predictions</p>
-            <h2 style="color: white; margin: 0.5rem 0; font-size: 2.5rem;">{}</h2>
-            <p style="color: rgba(255,255,255,0.7); margin: 0; font-size: 0.8rem;">{}</p>
-        </div>
-        """.format(
-            stats.get('today_predictions', 0),
-            datetime.now().strftime('%b %d, %Y')
-        ), unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown("""
-        <div style="background: linear-gradient(135deg, #dc3545, #c82333);
-                    padding: 1.5rem; border-radius: 16px; text-align: center;
-                    box-shadow: 0 4px 15px rgba(220, 53, 69, 0.3);">
-            <p style="color: rgba(255,255,255,0.8); margin: 0; font-size: 0.9rem;">High Risk Rate</p>
-            <h2 style="color: white; margin: 0.5rem 0; font-size: 2.5rem;">{}%</h2>
-            <p style="color: rgba(255,255,255,0.7); margin: 0; font-size: 0.8rem;">Of all predictions</p>
-        </div>
-        """.format(stats.get('high_risk_rate', 0)), unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown("""
-        <div style="background: linear-gradient(135deg, #ffc107, #fd7e14);
-                    padding: 1.5rem; border-radius: 16px; text-align: center;
-                    box-shadow: 0 4px 15px rgba(255, 193, 7, 0.3);">
-            <p style="color: rgba(255,255,255,0.8); margin: 0; font-size: 0.9rem;">Total Alerts</p>
-            <h2 style="color: white; margin: 0.5rem 0; font-size: 2.5rem;">{}</h2>
-            <p style="color: rgba(255,255,255,0.7); margin: 0; font-size: 0.8rem;">Alert rate: {}%</p>
-        </div>
-        """.format(
-            stats.get('total_alerts', 0),
-            stats.get('alert_rate', 0)
-        ), unsafe_allow_html=True)
+    get = stats.get
+    total_predictions = get('total_predictions', 0)
+    today_predictions = get('today_predictions', 0)
+    high_risk_rate = get('high_risk_rate', 0)
+    total_alerts = get('total_alerts', 0)
+    alert_rate = get('alert_rate', 0)
+    today = datetime.now().strftime('%b %d, %Y')
+    
+    cards = [
+        {
+            'label': "Total Predictions",
+            'value': total_predictions,
+            'footer': "All time",
+            'grad_a': "#0077b6", 'grad_b': "#023e8a",
+            'shadow': "rgba(0, 119, 182, 0.3)"
+        },
+        {
+            'label': "Today's Predictions",
+            'value': today_predictions,
+            'footer': today,
+            'grad_a': "#28a745", 'grad_b': "#20c997",
+            'shadow': "rgba(40, 167, 69, 0.3)"
+        },
+        {
+            'label': "High Risk Rate",
+            'value': f"{high_risk_rate}%",
+            'footer': "Of all predictions",
+            'grad_a': "#dc3545", 'grad_b': "#c82333",
+            'shadow': "rgba(220, 53, 69, 0.3)"
+        },
+        {
+            'label': "Total Alerts",
+            'value': total_alerts,
+            'footer': f"Alert rate: {alert_rate}%",
+            'grad_a': "#ffc107", 'grad_b': "#fd7e14",
+            'shadow': "rgba(255, 193, 7, 0.3)"
+        }
+    ]
+    
+    for col, card in zip(st.columns(4), cards):
+        col.markdown(_METRIC_CARD_TEMPLATE.format_map(card), unsafe_allow_html=True)
 
 
-def render_risk_distribution_chart(risk_distribution: Dict[str, int]) -> None:
-    """Render a pie chart of risk level distribution."""
-    st.subheader("🎯 Risk Level Distribution")
-    
-    if not risk_distribution:
-        st.info("No prediction data available yet.")
-        return
-    
-    colors = {
-        'Low': '#28a745',
-        'Medium': '#ffc107',
-        'High': '#dc3545'
-    }
+@st.cache_resource
+def _cdss_template() -> "go.layout.Template":
+    """Shared layout template for the dashboard charts, built once per process."""
+    import plotly.graph_objects as go
+    import plotly.io as pio
+    
+    template = go.layout.Template(pio.templates["plotly"])
+    template.layout.update(
+        height=350,
+        margin=dict(t=20, b=40, l=40, r=20),
+        legend=dict(orientation='h', yanchor='bottom')
+    )
+    return template
+
+
+@st.cache_data(max_entries=20)
+def _build_risk_pie(items: tuple) -> "go.Figure":
+    """Build the risk distribution pie chart from (label, count) pairs."""
+    import plotly.graph_objects as go
     
-    labels = list(risk_distribution.keys())
-    values = list(risk_distribution.values())
-    chart_colors = [colors.get(label, '#6c757d') for label in labels]
+    labels = [label for label, _ in items]
+    values = [value for _, value in items]
+    chart_colors = [_RISK_COLORS.get(label, _RISK_DEFAULT_COLOR) for label in labels]
     
     fig = go.Figure(data=[go.Pie(
         labels=labels,
@@ -157,32 +256,23 @@ def render_risk_distribution_chart(risk_distribution: Dict[str, int]) -> None:
     )])
     
     fig.update_layout(
+        template=_cdss_template(),
         showlegend=True,
-        legend=dict(orientation='h', yanchor='bottom', y=-0.2),
-        height=350,
-        margin=dict(t=20, b=60, l=20, r=20)
+        legend=dict(y=-0.2),
+        margin=dict(b=60, l=20)
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
-def render_alert_distribution_chart(alert_distribution: Dict[str, int]) -> None:
-    """Render a bar chart of alerts by risk level."""
-    st.subheader("🔔 Alerts by Risk Level")
-    
-    if not alert_distribution:
-        st.info("No alert data available yet.")
-        return
+@st.cache_data(max_entries=20)
+def _build_alert_bar(items: tuple) -> "go.Figure":
+    """Build the alerts-by-risk-level bar chart from (label, count) pairs."""
+    import plotly.graph_objects as go
     
-    colors = {
-        'Low': '#28a745',
-        'Medium': '#ffc107',
-        'High': '#dc3545'
-    }
-    
-    labels = list(alert_distribution.keys())
-    values = list(alert_distribution.values())
-    chart_colors = [colors.get(label, '#6c757d') for label in labels]
+    labels = [label for label, _ in items]
+    values = [value for _, value in items]
+    chart_colors = [_RISK_COLORS.get(label, _RISK_DEFAULT_COLOR) for label in labels]
     
     fig = go.Figure(data=[go.Bar(
         x=labels,
@@ -193,37 +283,28 @@ def render_alert_distribution_chart(alert_distribution: Dict[str, int]) -> None:
     )])
     
     fig.update_layout(
+        template=_cdss_template(),
         xaxis_title="Risk Level",
-        yaxis_title="Number of Alerts",
-        height=350,
-        margin=dict(t=20, b=40, l=40, r=20)
+        yaxis_title="Number of Alerts"
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
-def render_prediction_trends_chart() -> None:
-    """Render a line chart of prediction trends over time."""
-    st.subheader("📈 Prediction Trends (Last 7 Days)")
-    
-    try:
-        trends = get_prediction_trends(days=7)
-    except Exception as e:
-        st.error(f"Error loading trends: {e}")
-        return
-    
-    if not trends:
-        st.info("Not enough data to show trends. Make some predictions first!")
-        return
+@st.cache_data(max_entries=20)
+def _build_trends_chart(rows: tuple) -> "go.Figure":
+    """Build the trends line chart from (date, low, medium, high) rows."""
+    import plotly.graph_objects as go
     
-    dates = [t['date'] for t in trends]
+    # Transpose the rows in one pass
+    dates, low_risk, medium_risk, high_risk = (list(col) for col in zip(*rows))
     
     fig = go.Figure()
     
     # Add traces for each risk level
     fig.add_trace(go.Scatter(
         x=dates,
-        y=[t['low_risk'] for t in trends],
+        y=low_risk,
         name='Low Risk',
         line=dict(color='#28a745', width=3),
         mode='lines+markers',
@@ -233,7 +314,7 @@ def render_prediction_trends_chart() -> None:
     
     fig.add_trace(go.Scatter(
         x=dates,
-        y=[t['medium_risk'] for t in trends],
+        y=medium_risk,
         name='Medium Risk',
         line=dict(color='#ffc107', width=3),
         mode='lines+markers'
@@ -241,24 +322,71 @@ def render_prediction_trends_chart() -> None:
     
     fig.add_trace(go.Scatter(
         x=dates,
-        y=[t['high_risk'] for t in trends],
+        y=high_risk,
         name='High Risk',
         line=dict(color='#dc3545', width=3),
         mode='lines+markers'
     ))
     
     fig.update_layout(
+        template=_cdss_template(),
         xaxis_title="Date",
         yaxis_title="Number of Predictions",
-        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1),
+        legend=dict(y=1.02, xanchor='right', x=1),
         height=400,
-        margin=dict(t=60, b=40, l=40, r=20),
+        margin=dict(t=60),
         hovermode='x unified'
     )
     
+    return fig
+
+
+def render_risk_distribution_chart(risk_distribution: Dict[str, int]) -> None:
+    """Render a pie chart of risk level distribution."""
+    st.subheader("🎯 Risk Level Distribution")
+    
+    if not risk_distribution:
+        st.info("No prediction data available yet.")
+        return
+    
+    fig = _build_risk_pie(tuple(risk_distribution.items()))
     st.plotly_chart(fig, use_container_width=True)
 
 
+def render_alert_distribution_chart(alert_distribution: Dict[str, int]) -> None:
+    """Render a bar chart of alerts by risk level."""
+    st.subheader("🔔 Alerts by Risk Level")
+    
+    if not alert_distribution:
+        st.info("No alert data available yet.")
+        return
+    
+    fig = _build_alert_bar(tuple(alert_distribution.items()))
+    st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment
+def render_prediction_trends_chart() -> None:
+    """Render a line chart of prediction trends over time."""
+    st.subheader("📈 Prediction Trends (Last 7 Days)")
+    
+    try:
+        trends = _cached_trends(days=7)
+    except Exception as e:
+        st.error(f"Error loading trends: {e}")
+        return
+    
+    if not trends:
+        st.info("Not enough data to show trends. Make some predictions first!")
+        return
+    
+    fig = _build_trends_chart(tuple(
+        (t['date'], t['low_risk'], t['medium_risk'], t['high_risk']) for t in trends
+    ))
+    st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment
 def render_recent_predictions() -> None:
     """Render a table of recent predictions."""
     st.subheader("📋 Recent Predictions")
@@ -278,7 +406,7 @@ def render_recent_predictions() -> None:
         )
     
     try:
-        predictions = get_predictions(
+        predictions = _cached_predictions(
             limit=limit,
             risk_level=None if risk_filter == "All" else risk_filter
         )
@@ -291,25 +419,7 @@ def render_recent_predictions() -> None:
         return
     
     # Format for display
-    display_data = []
-    for pred in predictions:
-        risk_color = {
-            'Low': '🟢',
-            'Medium': '🟡',
-            'High': '🔴'
-        }.get(pred.get('risk_level', ''), '⚪')
-        
-        display_data.append({
-            'Patient ID': pred.get('patient_id', '-') or '-',
-            'Doctor ID': pred.get('doctor_id', '-') or '-',
-            'Time': pred.get('timestamp', '')[:19] if pred.get('timestamp') else '-',
-            'Risk': f"{risk_color} {pred.get('risk_level', '')}",
-            'Confidence': f"{pred.get('risk_probability', 0):.1%}" if pred.get('risk_probability') else 'N/A',
-            'HR': pred.get('heart_rate', '-'),
-            'BP': f"{pred.get('blood_pressure_systolic', '-')}/{pred.get('blood_pressure_diastolic', '-')}",
-            'SpO2': f"{pred.get('oxygen_saturation', '-')}%",
-            'Alert': '🔔' if pred.get('alert_generated') else '-'
-        })
+    display_data = _format_predictions(predictions)
     
     st.dataframe(
         display_data,
@@ -318,19 +428,23 @@ def render_recent_predictions() -> None:
     )
 
 
+@st.fragment
 def render_export_section() -> None:
     """Render the data export section."""
     st.subheader("📥 Export Data")
     
     # Show total records count
-    total_records = get_total_records()
+    total_records = _cached_total()
     st.markdown(f"**Total Records in Database:** {total_records}")
     
+    # Exports are invalidated whenever the record count or latest entry changes
+    cache_key = (total_records, get_latest_timestamp())
+    
     col1, col2 = st.columns(2)
     
     with col1:
         # Excel Export Button
-        excel_data = export_predictions_excel()
+        excel_data = _cached_excel_export(cache_key)
         if excel_data:
             st.download_button(
                 label="📊 Download All Records (Excel)",
@@ -359,9 +473,10 @@ def render_export_section() -> None:
         
         if st.button("📄 Export Date Range (CSV)", use_container_width=True):
             try:
-                csv_data = export_predictions_csv(
-                    start_date=start_date.isoformat(),
-                    end_date=end_date.isoformat()
+                csv_data = _cached_csv_export(
+                    start_date.isoformat(),
+                    end_date.isoformat(),
+                    cache_key
                 )
                 
                 if csv_data:
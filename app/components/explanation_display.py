@@ -6,8 +6,8 @@ to help clinicians understand why the AI made its prediction.
 """
 
 import streamlit as st
+import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
 from typing import Dict, Optional
 import sys
 from pathlib import Path
@@ -16,11 +16,29 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from cdss_config import XAI_CONFIG
 
 
+# (color, icon, sign) for each factor direction
+_DIR = {
+    "increases_risk": ("#dc3545", "🔺", "+"),
+    "decreases_risk": ("#28a745", "🔻", "-")
+}
+
+# (minimum confidence %, icon, message, color), checked in order
+_CONFIDENCE_BANDS = (
+    (80, "✅", "High confidence prediction", "#28a745"),
+    (60, "ℹ️", "Moderate confidence - consider additional review", "#0077b6"),
+    (0, "⚠️", "Lower confidence - exercise clinical judgment", "#856404")
+)
+
+
+@st.fragment
 def render_explanation_section(explanation, show_chart: bool = True,
                                show_narrative: bool = True):
     """
     Render the XAI explanation section.
     
+    Runs as a fragment so interactions inside the panel rerun only this
+    section, not the surrounding assessment page.
+    
     Args:
         explanation: Explanation object from the explainer module
         show_chart: Whether to show the feature importance chart
@@ -48,45 +66,35 @@ def render_explanation_section(explanation, show_chart: bool = True,
         render_explanation_details(explanation)
 
 
-def render_feature_importance_chart(explanation):
-    """
-    Render horizontal bar chart showing feature contributions.
-    
-    Args:
-        explanation: Explanation object with top_factors
-    """
-    if not explanation.top_factors:
-        st.info("No feature contributions available.")
-        return
-    
-    # Prepare data
-    factors = explanation.top_factors
-    labels = [f.display_name for f in factors]
-    values = [f.contribution for f in factors]
-    colors = ['#dc3545' if v > 0 else '#28a745' for v in values]
+@st.cache_data(max_entries=20)
+def _build_importance_fig(labels: tuple, values: tuple, risk_level: str) -> go.Figure:
+    """Build the feature contribution bar chart for the given factors."""
+    v = np.asarray(values, dtype=float)
+    colors = np.where(v > 0, '#dc3545', '#28a745')
+    vmin, vmax = v.min(), v.max()
     
     # Create horizontal bar chart
     fig = go.Figure()
     
     fig.add_trace(go.Bar(
-        y=labels,
-        x=values,
+        y=list(labels),
+        x=v,
         orientation='h',
         marker_color=colors,
-        text=[f"{abs(v):.3f}" for v in values],
+        text=np.char.mod('%.3f', np.abs(v)),
         textposition='outside',
         hovertemplate='<b>%{y}</b><br>Contribution: %{x:.4f}<extra></extra>'
     ))
     
     fig.update_layout(
         title={
-            'text': f'Top Factors Contributing to {explanation.risk_level} Risk',
+            'text': f'Top Factors Contributing to {risk_level} Risk',
             'x': 0.5,
             'xanchor': 'center'
         },
         xaxis_title='Contribution to Risk Score',
         yaxis_title='Clinical Factor',
-        height=300 + len(factors) * 30,
+        height=300 + len(labels) * 30,
         showlegend=False,
         xaxis=dict(zeroline=True, zerolinewidth=2, zerolinecolor='gray'),
         margin=dict(l=20, r=20, t=60, b=40)
@@ -94,20 +102,41 @@ def render_feature_importance_chart(explanation):
     
     # Add annotations
     fig.add_annotation(
-        x=max(values) * 0.5 if max(values) > 0 else 0.1,
+        x=vmax * 0.5 if vmax > 0 else 0.1,
         y=-0.5,
         text="→ Increases Risk",
         showarrow=False,
         font=dict(color='#dc3545', size=10)
     )
     fig.add_annotation(
-        x=min(values) * 0.5 if min(values) < 0 else -0.1,
+        x=vmin * 0.5 if vmin < 0 else -0.1,
         y=-0.5,
         text="← Decreases Risk",
         showarrow=False,
         font=dict(color='#28a745', size=10)
     )
     
+    return fig
+
+
+def render_feature_importance_chart(explanation):
+    """
+    Render horizontal bar chart showing feature contributions.
+    
+    Args:
+        explanation: Explanation object with top_factors
+    """
+    if not explanation.top_factors:
+        st.info("No feature contributions available.")
+        return
+    
+    factors = explanation.top_factors
+    fig = _build_importance_fig(
+        tuple(f.display_name for f in factors),
+        tuple(f.contribution for f in factors),
+        explanation.risk_level
+    )
+    
     st.plotly_chart(fig, use_container_width=True)
     
     # Add legend
@@ -130,21 +159,28 @@ def render_narrative_explanation(explanation):
     # Display narrative with appropriate styling
     st.markdown(explanation.narrative)
     
-    # Add confidence indicator
+    # Confidence bar and band message emitted as one block
     confidence_pct = int(explanation.confidence * 100)
+    icon, label, color = next(band[1:] for band in _CONFIDENCE_BANDS if confidence_pct >= band[0])
     
     st.markdown("---")
-    st.markdown(f"**Model Confidence:** {confidence_pct}%")
-    
-    # Progress bar for confidence
-    st.progress(explanation.confidence)
-    
-    if confidence_pct >= 80:
-        st.success("High confidence prediction")
-    elif confidence_pct >= 60:
-        st.info("Moderate confidence - consider additional review")
-    else:
-        st.warning("Lower confidence - exercise clinical judgment")
+    st.markdown(f"""
+    <div>
+        <p><b>Model Confidence:</b> {confidence_pct}%</p>
+        <progress value="{confidence_pct}" max="100" style="width: 100%; accent-color: {color};"></progress>
+        <p style="color: {color}; margin-top: 0.5rem;">{icon} {label}</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+@st.cache_data(max_entries=20)
+def _format_all_contributions(items: tuple) -> str:
+    """Format (feature, contribution) pairs as text, largest magnitude first."""
+    sorted_contribs = sorted(items, key=lambda x: abs(x[1]), reverse=True)
+    return "\n".join(
+        f"{feature}: {'↑' if contrib > 0 else '↓'} {contrib:.6f}"
+        for feature, contrib in sorted_contribs
+    )
 
 
 def render_explanation_details(explanation):
@@ -156,42 +192,19 @@ def render_explanation_details(explanation):
     """
     st.markdown("#### Detailed Factor Analysis")
     
-    # Table of all contributing factors
+    # Table of all contributing factors, emitted as one markdown block
     if explanation.top_factors:
+        rows = ["| Factor | Value | Contribution |", "|---|---|---|"]
         for factor in explanation.top_factors:
-            with st.container():
-                col1, col2, col3 = st.columns([3, 1, 1])
-                
-                with col1:
-                    st.markdown(f"**{factor.display_name}**")
-                
-                with col2:
-                    # Display value
-                    if isinstance(factor.value, float):
-                        st.markdown(f"Value: `{factor.value:.2f}`")
-                    else:
-                        st.markdown(f"Value: `{factor.value}`")
-                
-                with col3:
-                    # Display contribution with color
-                    if factor.direction == "increases_risk":
-                        st.markdown(f"🔺 +{abs(factor.contribution):.4f}")
-                    else:
-                        st.markdown(f"🔻 -{abs(factor.contribution):.4f}")
-                
-                st.markdown("---")
+            value = f"{factor.value:.2f}" if isinstance(factor.value, float) else factor.value
+            _, icon, sign = _DIR.get(factor.direction, _DIR["decreases_risk"])
+            rows.append(f"| **{factor.display_name}** | `{value}` | {icon} {sign}{abs(factor.contribution):.4f} |")
+        st.markdown("\n".join(rows))
     
     # Show all contributions in expander
     with st.expander("View All Feature Contributions"):
         if explanation.all_contributions:
-            sorted_contribs = sorted(
-                explanation.all_contributions.items(),
-                key=lambda x: abs(x[1]),
-                reverse=True
-            )
-            for feature, contrib in sorted_contribs:
-                direction = "↑" if contrib > 0 else "↓"
-                st.text(f"{feature}: {direction} {contrib:.6f}")
+            st.code(_format_all_contributions(tuple(explanation.all_contributions.items())))
 
 
 def render_explanation_button(on_click_callback):
@@ -222,49 +235,30 @@ def render_compact_explanation(explanation):
     
     st.markdown("##### Key Factors:")
     
-    # Show top 3 factors only
+    # Show top 3 factors only, as a single HTML block
     top_3 = explanation.top_factors[:3] if explanation.top_factors else []
     
+    rows = []
     for factor in top_3:
-        icon = "🔺" if factor.direction == "increases_risk" else "🔻"
-        color = "#dc3545" if factor.direction == "increases_risk" else "#28a745"
-        st.markdown(
-            f"{icon} **{factor.display_name}**: "
-            f"<span style='color:{color}'>{abs(factor.contribution):.3f}</span>",
-            unsafe_allow_html=True
+        color, icon, _ = _DIR.get(factor.direction, _DIR["decreases_risk"])
+        rows.append(
+            f"<div>{icon} <b>{factor.display_name}</b>: "
+            f"<span style='color:{color}'>{abs(factor.contribution):.3f}</span></div>"
         )
+    
+    if rows:
+        st.markdown("".join(rows), unsafe_allow_html=True)
 
 
-def render_shap_waterfall(explanation):
-    """
-    Render SHAP waterfall chart if SHAP values are available.
-    
-    Args:
-        explanation: Explanation object with SHAP data
-    """
-    if explanation.method != 'shap' or explanation.shap_values is None:
-        st.info("Waterfall chart requires SHAP explanation")
-        return
-    
-    # Create waterfall chart using plotly
-    factors = explanation.top_factors
-    
-    if not factors:
-        return
-    
+@st.cache_data(max_entries=20)
+def _build_waterfall_fig(names: tuple, contributions: tuple, base_value: float) -> go.Figure:
+    """Build the SHAP waterfall chart for the given factors."""
     # Prepare data for waterfall
-    labels = ['Base'] + [f.display_name for f in factors] + ['Final']
-    
-    # Calculate cumulative values
-    base_value = explanation.base_value or 0
-    contributions = [f.contribution for f in factors]
+    labels = ['Base'] + list(names) + ['Final']
     
-    values = [base_value]
-    cumulative = base_value
-    for c in contributions:
-        cumulative += c
-        values.append(c)
-    values.append(cumulative - sum(contributions))  # Difference for final
+    # Base, each contribution, then the final total (the running sum minus
+    # the contributions, i.e. the base value again)
+    values = np.concatenate(([base_value], np.asarray(contributions, dtype=float), [base_value]))
     
     fig = go.Figure(go.Waterfall(
         orientation='v',
@@ -283,4 +277,30 @@ def render_shap_waterfall(explanation):
         height=400
     )
     
+    return fig
+
+
+def render_shap_waterfall(explanation):
+    """
+    Render SHAP waterfall chart if SHAP values are available.
+    
+    Args:
+        explanation: Explanation object with SHAP data
+    """
+    if explanation.method != 'shap' or explanation.shap_values is None:
+        st.info("Waterfall chart requires SHAP explanation")
+        return
+    
+    # Create waterfall chart using plotly
+    factors = explanation.top_factors
+    
+    if not factors:
+        return
+    
+    fig = _build_waterfall_fig(
+        tuple(f.display_name for f in factors),
+        tuple(f.contribution for f in factors),
+        explanation.base_value or 0
+    )
+    
     st.plotly_chart(fig, use_container_width=True)
@@ -6,7 +6,9 @@ Provides UI for importing patient data from FHIR bundles
 """
 
 import streamlit as st
+import io
 import json
+from collections import Counter
 from typing import Optional, Dict
 from pathlib import Path
 import sys
@@ -14,6 +16,43 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from cdss_config import FHIR_CONFIG
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+
+def _parse_json_bytes(data: bytes) -> Dict:
+    """Parse JSON from raw bytes, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _peek_resource_type(data: bytes) -> Optional[str]:
+    """
+    Stream the document for its top-level resourceType without building it.
+    
+    Returns None if ijson is not installed, the key is absent, or the
+    document is malformed (the full parse reports the error in that case).
+    """
+    if not IJSON_AVAILABLE:
+        return None
+    try:
+        for prefix, event, value in ijson.parse(io.BytesIO(data)):
+            if prefix == 'resourceType' and event == 'string':
+                return value
+    except ijson.JSONError:
+        return None
+    return None
+
 
 def render_fhir_import_section(on_import_callback):
     """
@@ -49,8 +88,15 @@ def render_file_upload(on_import_callback):
     
     if uploaded_file is not None:
         try:
-            content = uploaded_file.read().decode('utf-8')
-            bundle = json.loads(content)
+            data = uploaded_file.getvalue()
+            
+            # Reject non-bundle documents before materializing them
+            if _peek_resource_type(data) not in (None, 'Bundle'):
+                st.error("❌ Invalid FHIR Bundle: resourceType must be 'Bundle'")
+                return
+            
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            bundle = _parse_json_bytes(data)
             
             # Validate it's a FHIR bundle
             if bundle.get('resourceType') != 'Bundle':
@@ -61,14 +107,13 @@ def render_file_upload(on_import_callback):
             st.success(f"✅ Valid FHIR Bundle loaded")
             
             entries = bundle.get('entry', [])
-            resource_counts = {}
-            for entry in entries:
-                res_type = entry.get('resource', {}).get('resourceType', 'Unknown')
-                resource_counts[res_type] = resource_counts.get(res_type, 0) + 1
+            resource_counts = Counter(
+                entry.get('resource', {}).get('resourceType', 'Unknown') for entry in entries
+            )
             
-            st.markdown("**Bundle Contents:**")
-            for res_type, count in resource_counts.items():
-                st.markdown(f"- {res_type}: {count}")
+            st.markdown("**Bundle Contents:**\n" + "\n".join(
+                f"- {res_type}: {count}" for res_type, count in resource_counts.items()
+            ))
             
             if st.button("Import This Data", key="import_uploaded"):
                 on_import_callback(bundle)
@@ -80,12 +125,9 @@ def render_file_upload(on_import_callback):
             st.error(f"❌ Error processing file: {e}")
 
 
-def render_sample_data(on_import_callback):
-    """Render sample data selection interface."""
-    st.markdown("#### Use Sample Patient Data")
-    st.markdown("Select a pre-configured sample patient for demonstration.")
-    
-    samples = {
+def _get_samples() -> Dict[str, Dict]:
+    """Sample patient bundles; the bundle data are the shared read-only module constants."""
+    return {
         "sample_1": {
             "name": "John Doe - Elderly Diabetic",
             "description": "69-year-old male with Type 2 Diabetes and Hypertension",
@@ -102,6 +144,23 @@ def render_sample_data(on_import_callback):
             "data": get_sample_complex_case()
         }
     }
+
+
+@st.cache_data(show_spinner=False)
+def _get_sample_json(sample_id: str) -> str:
+    """Pretty-printed JSON preview of a sample bundle."""
+    data = _get_samples()[sample_id]['data']
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, indent=2)
+
+
+def render_sample_data(on_import_callback):
+    """Render sample data selection interface."""
+    st.markdown("#### Use Sample Patient Data")
+    st.markdown("Select a pre-configured sample patient for demonstration.")
+    
+    samples = _get_samples()
     
     selected = st.selectbox(
         "Select Sample Patient",
@@ -114,7 +173,7 @@ def render_sample_data(on_import_callback):
         st.info(f"📋 {sample['description']}")
         
         with st.expander("Preview Bundle"):
-            st.json(sample['data'])
+            st.code(_get_sample_json(selected), language="json")
         
         if st.button("Load Sample Data", key="load_sample"):
             on_import_callback(sample['data'])
@@ -150,6 +209,41 @@ def render_manual_input(on_import_callback):
             st.error(f"❌ Invalid JSON: {e}")
 
 
+@st.cache_data(max_entries=50)
+def _demographics_md(patient_id: str, name: Optional[str], age: Optional[int],
+                     gender: Optional[str]) -> str:
+    """Markdown for the Patient Demographics section."""
+    lines = [f"**ID:** {patient_id}"]
+    if name:
+        lines.append(f"**Name:** {name}")
+    if age:
+        lines.append(f"**Age:** {age} years")
+    if gender:
+        lines.append(f"**Gender:** {gender.title()}")
+    return "#### Patient Demographics\n" + "  \n".join(lines)
+
+
+@st.cache_data(max_entries=50)
+def _vitals_md(items: tuple) -> str:
+    """Markdown for the Vital Signs section from (name, value) pairs."""
+    if not items:
+        return "#### Vital Signs\n_No vitals data_"
+    return "#### Vital Signs\n" + "  \n".join(
+        f"**{vital.replace('_', ' ').title()}:** {value}" for vital, value in items
+    )
+
+
+@st.cache_data(max_entries=100)
+def _list_md(title: str, items: tuple, bullet: str, empty: str,
+             humanize: bool = False) -> str:
+    """Markdown heading followed by a bullet list (or placeholder)."""
+    if not items:
+        return f"#### {title}\n{empty}"
+    if humanize:
+        items = tuple(item.replace('_', ' ') for item in items)
+    return f"#### {title}\n" + "\n".join(f"- {bullet}{item.title()}" for item in items)
+
+
 def render_fhir_data_preview(fhir_patient_data):
     """
     Render a preview of imported FHIR data.
@@ -157,271 +251,255 @@ def render_fhir_data_preview(fhir_patient_data):
     Args:
         fhir_patient_data: FHIRPatientData object from converter
     """
+    data = fhir_patient_data
     st.markdown("### 📊 Imported Patient Data")
     
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("#### Patient Demographics")
-        st.markdown(f"**ID:** {fhir_patient_data.patient_id}")
-        if fhir_patient_data.name:
-            st.markdown(f"**Name:** {fhir_patient_data.name}")
-        if fhir_patient_data.age:
-            st.markdown(f"**Age:** {fhir_patient_data.age} years")
-        if fhir_patient_data.gender:
-            st.markdown(f"**Gender:** {fhir_patient_data.gender.title()}")
+        st.markdown(_demographics_md(data.patient_id, data.name, data.age, data.gender))
     
     with col2:
-        st.markdown("#### Vital Signs")
-        if fhir_patient_data.vitals:
-            for vital, value in fhir_patient_data.vitals.items():
-                display_name = vital.replace('_', ' ').title()
-                st.markdown(f"**{display_name}:** {value}")
-        else:
-            st.markdown("_No vitals data_")
+        st.markdown(_vitals_md(tuple(data.vitals.items()) if data.vitals else ()))
     
     st.markdown("---")
     
     col3, col4 = st.columns(2)
     
     with col3:
-        st.markdown("#### Conditions")
-        if fhir_patient_data.conditions:
-            for condition in fhir_patient_data.conditions:
-                st.markdown(f"- {condition.replace('_', ' ').title()}")
-        else:
-            st.markdown("_No conditions recorded_")
-        
-        st.markdown("#### Allergies")
-        if fhir_patient_data.allergies:
-            for allergy in fhir_patient_data.allergies:
-                st.markdown(f"- ⚠️ {allergy.title()}")
-        else:
-            st.markdown("_No known allergies_")
+        st.markdown(
+            _list_md("Conditions", tuple(data.conditions or ()), "",
+                     "_No conditions recorded_", humanize=True)
+            + "\n\n"
+            + _list_md("Allergies", tuple(data.allergies or ()), "⚠️ ", "_No known allergies_")
+        )
     
     with col4:
-        st.markdown("#### Medications")
-        if fhir_patient_data.medications:
-            for med in fhir_patient_data.medications:
-                st.markdown(f"- 💊 {med.title()}")
-        else:
-            st.markdown("_No medications_")
-        
-        st.markdown("#### Symptoms")
-        if fhir_patient_data.symptoms:
-            for symptom in fhir_patient_data.symptoms:
-                st.markdown(f"- {symptom.replace('_', ' ').title()}")
-        else:
-            st.markdown("_No symptoms noted_")
+        st.markdown(
+            _list_md("Medications", tuple(data.medications or ()), "💊 ", "_No medications_")
+            + "\n\n"
+            + _list_md("Symptoms", tuple(data.symptoms or ()), "",
+                       "_No symptoms noted_", humanize=True)
+        )
+
+
+# Sample FHIR bundles (shared constants; treat as read-only)
+_SAMPLE_ELDERLY_DIABETIC = {
+    "resourceType": "Bundle",
+    "type": "collection",
+    "entry": [
+        {
+            "resource": {
+                "resourceType": "Patient",
+                "id": "elderly-diabetic-001",
+                "name": [{"given": ["John"], "family": "Doe"}],
+                "gender": "male",
+                "birthDate": "1956-05-15"
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "Observation",
+                "code": {"coding": [{"system": "http://loinc.org", "code": "8867-4"}]},
+                "valueQuantity": {"value": 82, "unit": "beats/minute"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "Observation",
+                "code": {"coding": [{"system": "http://loinc.org", "code": "8480-6"}]},
+                "valueQuantity": {"value": 142, "unit": "mmHg"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "Observation",
+                "code": {"coding": [{"system": "http://loinc.org", "code": "2708-6"}]},
+                "valueQuantity": {"value": 96, "unit": "%"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "Condition",
+                "code": {"text": "Type 2 Diabetes Mellitus"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "Condition",
+                "code": {"text": "Essential Hypertension"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "MedicationStatement",
+                "medicationCodeableConcept": {"text": "Metformin 500mg"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "MedicationStatement",
+                "medicationCodeableConcept": {"text": "Lisinopril 10mg"}
+            }
+        }
+    ]
+}
+
+
+_SAMPLE_YOUNG_HEALTHY = {
+    "resourceType": "Bundle",
+    "type": "collection",
+    "entry": [
+        {
+            "resource": {
+                "resourceType": "Patient",
+                "id": "young-healthy-001",
+                "name": [{"given": ["Jane"], "family": "Smith"}],
+                "gender": "female",
+                "birthDate": "1993-08-22"
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "Observation",
+                "code": {"coding": [{"system": "http://loinc.org", "code": "8867-4"}]},
+                "valueQuantity": {"value": 72, "unit": "beats/minute"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "Observation",
+                "code": {"coding": [{"system": "http://loinc.org", "code": "8480-6"}]},
+                "valueQuantity": {"value": 118, "unit": "mmHg"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "Observation",
+                "code": {"coding": [{"system": "http://loinc.org", "code": "2708-6"}]},
+                "valueQuantity": {"value": 99, "unit": "%"}
+            }
+        }
+    ]
+}
+
+
+_SAMPLE_COMPLEX_CASE = {
+    "resourceType": "Bundle",
+    "type": "collection",
+    "entry": [
+        {
+            "resource": {
+                "resourceType": "Patient",
+                "id": "complex-case-001",
+                "name": [{"given": ["Robert"], "family": "Johnson"}],
+                "gender": "male",
+                "birthDate": "1950-01-10"
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "Observation",
+                "code": {"coding": [{"system": "http://loinc.org", "code": "8867-4"}]},
+                "valueQuantity": {"value": 95, "unit": "beats/minute"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "Observation",
+                "code": {"coding": [{"system": "http://loinc.org", "code": "8480-6"}]},
+                "valueQuantity": {"value": 165, "unit": "mmHg"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "Observation",
+                "code": {"coding": [{"system": "http://loinc.org", "code": "8310-5"}]},
+                "valueQuantity": {"value": 38.1, "unit": "Cel"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "Observation",
+                "code": {"coding": [{"system": "http://loinc.org", "code": "2708-6"}]},
+                "valueQuantity": {"value": 91, "unit": "%"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "Condition",
+                "code": {"text": "Type 2 Diabetes Mellitus"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "Condition",
+                "code": {"text": "Chronic Heart Failure"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "Condition",
+                "code": {"text": "Chronic Kidney Disease Stage 3"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "MedicationStatement",
+                "medicationCodeableConcept": {"text": "Metformin 1000mg"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "MedicationStatement",
+                "medicationCodeableConcept": {"text": "Furosemide 40mg"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "MedicationStatement",
+                "medicationCodeableConcept": {"text": "Lisinopril 20mg"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "MedicationStatement",
+                "medicationCodeableConcept": {"text": "Aspirin 81mg"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "MedicationStatement",
+                "medicationCodeableConcept": {"text": "Warfarin 5mg"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "MedicationStatement",
+                "medicationCodeableConcept": {"text": "Atorvastatin 40mg"}
+            }
+        },
+        {
+            "resource": {
+                "resourceType": "AllergyIntolerance",
+                "code": {"text": "Penicillin"}
+            }
+        }
+    ]
+}
 
 
 # Sample data generators
 def get_sample_elderly_diabetic():
-    """Generate sample FHIR bundle for elderly diabetic patient."""
-    return {
-        "resourceType": "Bundle",
-        "type": "collection",
-        "entry": [
-            {
-                "resource": {
-                    "resourceType": "Patient",
-                    "id": "elderly-diabetic-001",
-                    "name": [{"given": ["John"], "family": "Doe"}],
-                    "gender": "male",
-                    "birthDate": "1956-05-15"
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "Observation",
-                    "code": {"coding": [{"system": "http://loinc.org", "code": "8867-4"}]},
-                    "valueQuantity": {"value": 82, "unit": "beats/minute"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "Observation",
-                    "code": {"coding": [{"system": "http://loinc.org", "code": "8480-6"}]},
-                    "valueQuantity": {"value": 142, "unit": "mmHg"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "Observation",
-                    "code": {"coding": [{"system": "http://loinc.org", "code": "2708-6"}]},
-                    "valueQuantity": {"value": 96, "unit": "%"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "Condition",
-                    "code": {"text": "Type 2 Diabetes Mellitus"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "Condition",
-                    "code": {"text": "Essential Hypertension"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "MedicationStatement",
-                    "medicationCodeableConcept": {"text": "Metformin 500mg"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "MedicationStatement",
-                    "medicationCodeableConcept": {"text": "Lisinopril 10mg"}
-                }
-            }
-        ]
-    }
+    """Return the sample FHIR bundle for an elderly diabetic patient."""
+    return _SAMPLE_ELDERLY_DIABETIC
 
 
 def get_sample_young_healthy():
-    """Generate sample FHIR bundle for young healthy patient."""
-    return {
-        "resourceType": "Bundle",
-        "type": "collection",
-        "entry": [
-            {
-                "resource": {
-                    "resourceType": "Patient",
-                    "id": "young-healthy-001",
-                    "name": [{"given": ["Jane"], "family": "Smith"}],
-                    "gender": "female",
-                    "birthDate": "1993-08-22"
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "Observation",
-                    "code": {"coding": [{"system": "http://loinc.org", "code": "8867-4"}]},
-                    "valueQuantity": {"value": 72, "unit": "beats/minute"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "Observation",
-                    "code": {"coding": [{"system": "http://loinc.org", "code": "8480-6"}]},
-                    "valueQuantity": {"value": 118, "unit": "mmHg"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "Observation",
-                    "code": {"coding": [{"system": "http://loinc.org", "code": "2708-6"}]},
-                    "valueQuantity": {"value": 99, "unit": "%"}
-                }
-            }
-        ]
-    }
+    """Return the sample FHIR bundle for a young healthy patient."""
+    return _SAMPLE_YOUNG_HEALTHY
 
 
 def get_sample_complex_case():
-    """Generate sample FHIR bundle for complex case patient."""
-    return {
-        "resourceType": "Bundle",
-        "type": "collection",
-        "entry": [
-            {
-                "resource": {
-                    "resourceType": "Patient",
-                    "id": "complex-case-001",
-                    "name": [{"given": ["Robert"], "family": "Johnson"}],
-                    "gender": "male",
-                    "birthDate": "1950-01-10"
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "Observation",
-                    "code": {"coding": [{"system": "http://loinc.org", "code": "8867-4"}]},
-                    "valueQuantity": {"value": 95, "unit": "beats/minute"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "Observation",
-                    "code": {"coding": [{"system": "http://loinc.org", "code": "8480-6"}]},
-                    "valueQuantity": {"value": 165, "unit": "mmHg"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "Observation",
-                    "code": {"coding": [{"system": "http://loinc.org", "code": "8310-5"}]},
-                    "valueQuantity": {"value": 38.1, "unit": "Cel"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "Observation",
-                    "code": {"coding": [{"system": "http://loinc.org", "code": "2708-6"}]},
-                    "valueQuantity": {"value": 91, "unit": "%"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "Condition",
-                    "code": {"text": "Type 2 Diabetes Mellitus"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "Condition",
-                    "code": {"text": "Chronic Heart Failure"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "Condition",
-                    "code": {"text": "Chronic Kidney Disease Stage 3"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "MedicationStatement",
-                    "medicationCodeableConcept": {"text": "Metformin 1000mg"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "MedicationStatement",
-                    "medicationCodeableConcept": {"text": "Furosemide 40mg"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "MedicationStatement",
-                    "medicationCodeableConcept": {"text": "Lisinopril 20mg"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "MedicationStatement",
-                    "medicationCodeableConcept": {"text": "Aspirin 81mg"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "MedicationStatement",
-                    "medicationCodeableConcept": {"text": "Warfarin 5mg"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "MedicationStatement",
-                    "medicationCodeableConcept": {"text": "Atorvastatin 40mg"}
-                }
-            },
-            {
-                "resource": {
-                    "resourceType": "AllergyIntolerance",
-                    "code": {"text": "Penicillin"}
-                }
-            }
-        ]
-    }
+    """Return the sample FHIR bundle for a complex case patient."""
+    return _SAMPLE_COMPLEX_CASE
@@ -5,18 +5,38 @@ Provides patient data input forms for the Streamlit application.
 """
 
 import streamlit as st
-from typing import Dict
-import sys
-from pathlib import Path
+from functools import lru_cache
+from typing import Dict, Tuple
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from cdss_config import (
     SYMPTOMS_LIST, VITAL_SIGNS, EXISTING_CONDITIONS,
     EXTENDED_VITAL_SIGNS, PAIN_SCORE_LABELS, GCS_INTERPRETATION, UI_STYLE
 )
 
 
+# (key, display label) pairs, built once at import
+_SYMPTOM_LABELS = tuple((s, s.replace("_", " ").title()) for s in SYMPTOMS_LIST)
+_CONDITION_LABELS = tuple(
+    (c, c.replace("_", " ").title()) for c in EXISTING_CONDITIONS if c != 'none'
+)
+
+# Same pairs striped across the three checkbox columns (item i -> column i % 3)
+_SYMPTOM_COLUMNS = tuple(_SYMPTOM_LABELS[i::3] for i in range(3))
+_CONDITION_COLUMNS = tuple(_CONDITION_LABELS[i::3] for i in range(3))
 
+_SYMPTOMS_HEADER_HTML = f"""
+    <h2 style='color: #60a5fa; font-family: {UI_STYLE['primary_font']};'>🩺 Clinical Data Input</h2>
+    <p style='color: {UI_STYLE['text_muted']}; font-size: 1.1rem; margin-bottom: 2rem;'>
+        Please provide comprehensive patient data for high-accuracy clinical risk prediction.
+    </p>
+"""
+
+# GCS score -> interpretation, indexed directly by the integer score
+_GCS_LUT = [None] * (max(high for _, high in GCS_INTERPRETATION) + 1)
+for (_low, _high), _label in GCS_INTERPRETATION.items():
+    for _score in range(_low, _high + 1):
+        _GCS_LUT[_score] = _GCS_LUT[_score] or _label
+del _low, _high, _label, _score
 
 
 def render_patient_demographics() -> Dict:
@@ -67,25 +87,19 @@ def render_patient_demographics() -> Dict:
 
 def render_symptoms_form() -> Dict:
     """Render symptoms checklist form."""
-    st.markdown(f"""
-        <h2 style='color: #60a5fa; font-family: {UI_STYLE['primary_font']};'>🩺 Clinical Data Input</h2>
-        <p style='color: {UI_STYLE['text_muted']}; font-size: 1.1rem; margin-bottom: 2rem;'>
-            Please provide comprehensive patient data for high-accuracy clinical risk prediction.
-        </p>
-    """, unsafe_allow_html=True)
-    
-    symptoms = {}
+    st.markdown(_SYMPTOMS_HEADER_HTML, unsafe_allow_html=True)
     
-    # Create a 3-column layout for symptoms
-    cols = st.columns(3)
+    checked = {}
     
-    for idx, symptom in enumerate(SYMPTOMS_LIST):
-        col_idx = idx % 3
-        with cols[col_idx]:
-            symptom_label = symptom.replace("_", " ").title()
-            symptoms[symptom] = 1 if st.checkbox(symptom_label, key=f"symptom_{symptom}") else 0
+    # Create a 3-column layout for symptoms, filling one column at a time
+    for col, column_items in zip(st.columns(3), _SYMPTOM_COLUMNS):
+        with col:
+            checked.update({
+                symptom: st.checkbox(label, key=f"symptom_{symptom}")
+                for symptom, label in column_items
+            })
     
-    return symptoms
+    return {symptom: int(checked[symptom]) for symptom, _ in _SYMPTOM_LABELS}
 
 
 def render_vital_signs() -> Dict:
@@ -152,34 +166,76 @@ def render_vital_signs() -> Dict:
     return vitals
 
 
-def get_vital_status(value: float, config: dict) -> tuple:
-    """
-    Determine the status of a vital sign value.
+_BOUND_KEYS = ('critical_low', 'critical_high', 'warning_low', 'warning_high',
+               'normal_min', 'normal_max')
+
+
+def _vital_bounds(config: dict) -> tuple:
+    """Flatten a vital-sign config into a hashable bounds tuple (None if unset)."""
+    return tuple(config.get(key) for key in _BOUND_KEYS)
+
+
+@lru_cache(maxsize=512)
+def _vital_status(value: float, bounds: tuple) -> tuple:
+    """Cached core of get_vital_status operating on a bounds tuple."""
+    critical_low, critical_high, warning_low, warning_high, normal_min, normal_max = bounds
     
-    Returns:
-        Tuple of (status_emoji, status_text, status_color)
-        🟢 = Normal, 🟡 = Warning, 🔴 = Critical
-    """
     # Check for critical values first
-    if 'critical_low' in config and value <= config['critical_low']:
+    if critical_low is not None and value <= critical_low:
         return "🔴", "Critical (Low)", "red"
-    if 'critical_high' in config and value >= config['critical_high']:
+    if critical_high is not None and value >= critical_high:
         return "🔴", "Critical (High)", "red"
     
     # Check for warning values
-    if 'warning_low' in config and value <= config['warning_low']:
+    if warning_low is not None and value <= warning_low:
         return "🟡", "Warning (Low)", "orange"
-    if 'warning_high' in config and value >= config['warning_high']:
+    if warning_high is not None and value >= warning_high:
         return "🟡", "Warning (High)", "orange"
     
     # Check if within normal range
-    normal_min = config.get('normal_min', float('-inf'))
-    normal_max = config.get('normal_max', float('inf'))
-    
-    if normal_min <= value <= normal_max:
+    if ((normal_min is None or normal_min <= value)
+            and (normal_max is None or value <= normal_max)):
         return "🟢", "Normal", "green"
-    else:
-        return "🟡", "Abnormal", "orange"
+    return "🟡", "Abnormal", "orange"
+
+
+def get_vital_status(value: float, config: dict) -> tuple:
+    """
+    Determine the status of a vital sign value.
+    
+    Returns:
+        Tuple of (status_emoji, status_text, status_color)
+        🟢 = Normal, 🟡 = Warning, 🔴 = Critical
+    """
+    return _vital_status(value, _vital_bounds(config))
+
+
+_STATUS_BG = {'green': '#d4edda', 'orange': '#fff3cd', 'red': '#f8d7da'}
+_BMI_TEMPLATE = (
+    '<div style="background-color: {bg}; padding: 10px; border-radius: 5px; margin: 5px 0;">'
+    '<strong>📊 BMI: {bmi} {unit}</strong> {emoji} {text}</div>'
+)
+
+_BLOOD_SUGAR_BOUNDS = _vital_bounds(EXTENDED_VITAL_SIGNS['blood_sugar'])
+_BMI_BOUNDS = _vital_bounds(EXTENDED_VITAL_SIGNS['bmi'])
+_PAIN_BOUNDS = _vital_bounds(EXTENDED_VITAL_SIGNS['pain_score'])
+_GCS_BOUNDS = _vital_bounds(EXTENDED_VITAL_SIGNS['consciousness_gcs'])
+
+
+@lru_cache(maxsize=256)
+def _bmi_badge(weight_kg: float, height_cm: float) -> tuple:
+    """BMI and its status badge HTML for a weight/height pair ('' if height is unset)."""
+    if height_cm <= 0:
+        return 0, ''
+    bmi = round(weight_kg * 10000.0 / (height_cm * height_cm), 1)
+    status_emoji, status_text, status_color = _vital_status(bmi, _BMI_BOUNDS)
+    return bmi, _BMI_TEMPLATE.format(
+        bg=_STATUS_BG.get(status_color, _STATUS_BG['red']),
+        bmi=bmi,
+        unit=EXTENDED_VITAL_SIGNS['bmi']['unit'],
+        emoji=status_emoji,
+        text=status_text
+    )
 
 
 def render_extended_vitals() -> Dict:
@@ -202,7 +258,7 @@ def render_extended_vitals() -> Dict:
             help=blood_sugar_config['help']
         )
         # Show status indicator
-        status_emoji, status_text, _ = get_vital_status(extended['blood_sugar'], blood_sugar_config)
+        status_emoji, status_text, _ = _vital_status(extended['blood_sugar'], _BLOOD_SUGAR_BOUNDS)
         st.caption(f"{status_emoji} {status_text}")
     
     with col2:
@@ -228,21 +284,9 @@ def render_extended_vitals() -> Dict:
         )
     
     # Calculate and display BMI
-    if extended['height'] > 0:
-        height_m = extended['height'] / 100
-        extended['bmi'] = round(extended['body_weight'] / (height_m ** 2), 1)
-        
-        bmi_config = EXTENDED_VITAL_SIGNS['bmi']
-        status_emoji, status_text, status_color = get_vital_status(extended['bmi'], bmi_config)
-        
-        st.markdown(f"""
-        <div style="background-color: {'#d4edda' if status_color == 'green' else '#fff3cd' if status_color == 'orange' else '#f8d7da'}; 
-                    padding: 10px; border-radius: 5px; margin: 5px 0;">
-            <strong>📊 BMI: {extended['bmi']} {bmi_config['unit']}</strong> {status_emoji} {status_text}
-        </div>
-        """, unsafe_allow_html=True)
-    else:
-        extended['bmi'] = 0
+    extended['bmi'], bmi_html = _bmi_badge(extended['body_weight'], extended['height'])
+    if bmi_html:
+        st.markdown(bmi_html, unsafe_allow_html=True)
     
     st.divider()
     
@@ -260,7 +304,7 @@ def render_extended_vitals() -> Dict:
         )
         # Show pain description and status
         pain_label = PAIN_SCORE_LABELS.get(extended['pain_score'], "Unknown")
-        status_emoji, status_text, _ = get_vital_status(extended['pain_score'], pain_config)
+        status_emoji, status_text, _ = _vital_status(extended['pain_score'], _PAIN_BOUNDS)
         st.caption(f"{status_emoji} {pain_label} - {status_text}")
     
     with col2:
@@ -274,12 +318,8 @@ def render_extended_vitals() -> Dict:
         )
         # Show GCS interpretation
         gcs_val = extended['consciousness_gcs']
-        gcs_interp = "Unknown"
-        for (low, high), label in GCS_INTERPRETATION.items():
-            if low <= gcs_val <= high:
-                gcs_interp = label
-                break
-        status_emoji, status_text, _ = get_vital_status(gcs_val, gcs_config)
+        gcs_interp = (_GCS_LUT[gcs_val] if 0 <= gcs_val < len(_GCS_LUT) else None) or "Unknown"
+        status_emoji, status_text, _ = _vital_status(gcs_val, _GCS_BOUNDS)
         st.caption(f"{status_emoji} {gcs_interp}")
     
     return extended
@@ -290,110 +330,66 @@ def render_medical_history() -> Dict:
     st.subheader("📋 Medical History")
     st.caption("Select any pre-existing conditions")
     
-    conditions = {}
-    
-    # Filter out 'none' from conditions list
-    condition_list = [c for c in EXISTING_CONDITIONS if c != 'none']
+    checked = {}
     
-    cols = st.columns(3)
+    for col, column_items in zip(st.columns(3), _CONDITION_COLUMNS):
+        with col:
+            checked.update({
+                condition: st.checkbox(label, key=f"condition_{condition}")
+                for condition, label in column_items
+            })
     
-    for idx, condition in enumerate(condition_list):
-        col_idx = idx % 3
-        with cols[col_idx]:
-            condition_label = condition.replace("_", " ").title()
-            conditions[condition] = 1 if st.checkbox(condition_label, key=f"condition_{condition}") else 0
-    
-    return conditions
+    return {condition: int(checked[condition]) for condition, _ in _CONDITION_LABELS}
 
 
-def render_complete_form() -> Dict:
+def render_complete_form() -> Tuple[Dict, bool]:
     """
     Render the complete patient input form.
     
+    All sections live inside a single ``st.form`` so widget edits are batched
+    and the script only reruns when the form is submitted.
+    
     Returns:
-        Dictionary containing all patient data
+        Tuple of (dictionary containing all patient data, submitted flag)
     """
     patient_data = {}
     
-    # Demographics
-    with st.container():
-        demographics = render_patient_demographics()
-        patient_data.update(demographics)
-    
-    st.divider()
-    
-    # Symptoms
-    with st.container():
-        symptoms = render_symptoms_form()
-        patient_data.update(symptoms)
-    
-    st.divider()
-    
-    # Vital Signs
-    with st.container():
-        vitals = render_vital_signs()
-        patient_data.update(vitals)
-    
-    st.divider()
-    
-    # Extended Vital Signs
-    with st.container():
-        extended_vitals = render_extended_vitals()
-        patient_data.update(extended_vitals)
-    
-    st.divider()
-    
-    # Medical History
-    with st.container():
-        history = render_medical_history()
-        patient_data.update(history)
-    
-    return patient_data
-
-
-def validate_patient_data(data: Dict) -> tuple:
-    """
-    Validate patient data before prediction.
+    with st.form("cdss_patient_form", border=False):
+        # Demographics
+        with st.container():
+            demographics = render_patient_demographics()
+            patient_data.update(demographics)
+        
+        st.divider()
+        
+        # Symptoms
+        with st.container():
+            symptoms = render_symptoms_form()
+            patient_data.update(symptoms)
+        
+        st.divider()
+        
+        # Vital Signs
+        with st.container():
+            vitals = render_vital_signs()
+            patient_data.update(vitals)
+        
+        st.divider()
+        
+        # Extended Vital Signs
+        with st.container():
+            extended_vitals = render_extended_vitals()
+            patient_data.update(extended_vitals)
+        
+        st.divider()
+        
+        # Medical History
+        with st.container():
+            history = render_medical_history()
+            patient_data.update(history)
+        
+        st.divider()
+        
+        submitted = st.form_submit_button("🔍 Analyze Risk", type="primary", use_container_width=True)
     
-    Returns:
-        Tuple of (is_valid, list of errors)
-    """
-    errors = []
-    
-    # Check age
-    if data.get('age', 0) < 0 or data.get('age', 0) > 120:
-        errors.append("Age must be between 0 and 120")
-    
-    # Check vital signs for critical values
-    if data.get('oxygen_saturation', 100) < 85:
-        errors.append("⚠️ Warning: Very low oxygen saturation detected")
-    
-    if data.get('heart_rate', 75) < 40 or data.get('heart_rate', 75) > 180:
-        errors.append("⚠️ Warning: Abnormal heart rate detected")
-    
-    # Check extended vital signs
-    blood_sugar = data.get('blood_sugar', 90)
-    if blood_sugar < 50:
-        errors.append("🔴 Critical: Dangerously low blood sugar (hypoglycemia)")
-    elif blood_sugar > 200:
-        errors.append("🔴 Critical: Very high blood sugar detected")
-    elif blood_sugar < 70 or blood_sugar > 125:
-        errors.append("⚠️ Warning: Abnormal blood sugar level")
-    
-    bmi = data.get('bmi', 22)
-    if bmi < 15 or bmi > 40:
-        errors.append("⚠️ Warning: BMI in critical range")
-    
-    pain_score = data.get('pain_score', 0)
-    if pain_score >= 8:
-        errors.append("🔴 Critical: Severe pain reported")
-    elif pain_score >= 6:
-        errors.append("⚠️ Warning: Significant pain reported")
-    
-    gcs = data.get('consciousness_gcs', 15)
-    if gcs <= 8:
-        errors.append("🔴 Critical: Severe consciousness impairment (GCS ≤ 8)")
-    elif gcs <= 12:
-        errors.append("⚠️ Warning: Consciousness impairment detected")
-    
-    return len([e for e in errors if not e.startswith("⚠️") and not e.startswith("🔴")]) == 0, errors
+    return patient_data, submitted
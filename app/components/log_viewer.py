@@ -6,22 +6,125 @@ Now uses SQLite database for consistent data with Analytics Dashboard.
 """
 
 import streamlit as st
-import pandas as pd
-from datetime import datetime, timedelta
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from datetime import datetime
+from typing import Optional
 
 from app.database.db import (
     get_statistics,
-    get_predictions,
-    get_alerts,
+    get_predictions_columnar,
+    get_alerts_columnar,
     get_total_records
 )
 from app.auth import get_current_user, UserRole
 
 
+_RISK_BADGES = {'Low': '🟢 Low', 'Medium': '🟡 Medium', 'High': '🔴 High'}
+
+_PREDICTION_COLUMN_CONFIG = {
+    'Risk Level': st.column_config.TextColumn('Risk Level', width='small'),
+    'Probability': st.column_config.TextColumn('Probability', width='small'),
+    'Symptoms': st.column_config.NumberColumn('Symptoms', format='%d'),
+    'Conditions': st.column_config.NumberColumn('Conditions', format='%d'),
+}
+
+
+_PREDICTION_COLUMN_NAMES = {
+    'timestamp': 'Time',
+    'user_name': 'User',
+    'risk_level': 'Risk Level',
+    'risk_probability': 'Probability',
+    'alert_generated': 'Alert',
+    'symptom_count': 'Symptoms',
+    'condition_count': 'Conditions'
+}
+
+_ALERT_COLUMN_NAMES = {
+    'timestamp': 'Time',
+    'user_name': 'User',
+    'risk_level': 'Risk Level',
+    'alert_message': 'Alert Message'
+}
+
+# Prediction columns shown in the log table, in display order
+_PREDICTION_DISPLAY_COLS = tuple(_PREDICTION_COLUMN_NAMES)
+
+# Pages up to this size are formatted without pandas
+_SMALL_TABLE_ROWS = 25
+
+
+_PREDICTION_FORMATTERS = {
+    'risk_level': lambda v: _RISK_BADGES.get(v, v),
+    'risk_probability': lambda v: 'N/A' if v is None else f"{v * 100:.1f}%",
+    'alert_generated': lambda v: "✅ Yes" if v else "❌ No",
+}
+
+
+def _format_prediction_columns(predictions: dict) -> dict:
+    """Display columns for a page of predictions, formatted like the DataFrame path."""
+    table = {}
+    for key, label in _PREDICTION_COLUMN_NAMES.items():
+        fmt = _PREDICTION_FORMATTERS.get(key)
+        table[label] = [fmt(value) for value in predictions[key]] if fmt else predictions[key]
+    return table
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_stats() -> dict:
+    """Cached summary statistics (refreshed every 30 seconds)."""
+    return get_statistics()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_predictions(limit: int, risk_level: Optional[str]) -> dict:
+    """Cached prediction display columns for a given page size and risk filter."""
+    return get_predictions_columnar(
+        limit=limit, risk_level=risk_level, columns=_PREDICTION_DISPLAY_COLS, format_timestamp=True
+    )
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_alerts(limit: int) -> dict:
+    """Cached recent alerts (display columns only)."""
+    return get_alerts_columnar(limit=limit, columns=tuple(_ALERT_COLUMN_NAMES), format_timestamp=True)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_prediction_table(limit: int, risk_level: Optional[str]):
+    """Formatted prediction log table for a page size and risk filter."""
+    predictions = _cached_predictions(limit, risk_level)
+    
+    if len(predictions['timestamp']) <= _SMALL_TABLE_ROWS:
+        # Small pages: format the columns directly and skip DataFrame construction
+        return _format_prediction_columns(predictions)
+    
+    import numpy as np
+    import pandas as pd  # deferred: keeps pandas off the app's cold-start path
+    
+    # Columnar input: no row-to-column transpose during construction
+    df = pd.DataFrame(predictions)
+    
+    # Format columns
+    probability = df['risk_probability'].to_numpy(dtype=float)
+    df['risk_probability'] = np.where(
+        np.isnan(probability), 'N/A', np.char.mod('%.1f%%', probability * 100)
+    )
+    df['alert_generated'] = np.where(df['alert_generated'].astype(bool), "✅ Yes", "❌ No")
+    df['risk_level'] = df['risk_level'].map(_RISK_BADGES).fillna(df['risk_level'])
+    
+    return df.rename(columns=_PREDICTION_COLUMN_NAMES)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_alert_table(limit: int):
+    """Formatted alert log table for the most recent alerts."""
+    import pandas as pd
+    
+    # Select columns for display (database uses user_name instead of user)
+    df = pd.DataFrame(_cached_alerts(limit))
+    
+    return df.rename(columns=_ALERT_COLUMN_NAMES)
+
+
 def render_log_viewer():
     """Render the log viewer dashboard (admin only)."""
     user = get_current_user()
@@ -33,8 +136,8 @@ def render_log_viewer():
     st.header("📊 System Logs & Analytics")
     st.caption("View prediction history and system statistics")
     
-    # Statistics overview - now from database
-    stats = get_statistics()
+    # Statistics overview - now from database (cached)
+    stats = _cached_stats()
     
     st.subheader("📈 Quick Stats")
     col1, col2, col3, col4 = st.columns(4)
@@ -80,19 +183,16 @@ def render_log_viewer():
         col_chart1, col_chart2 = st.columns([2, 1])
         
         with col_chart1:
-            # Create a horizontal bar chart
+            # Create a bar chart straight from column lists (no DataFrame round-trip)
             risk_dist = stats.get('risk_distribution', {})
-            risk_data = pd.DataFrame({
-                'Risk Level': ['Low', 'Medium', 'High'],
-                'Count': [
-                    risk_dist.get('Low', 0),
-                    risk_dist.get('Medium', 0),
-                    risk_dist.get('High', 0)
-                ],
-                'Color': ['#28a745', '#ffc107', '#dc3545']
-            })
-            
-            st.bar_chart(risk_data.set_index('Risk Level')['Count'])
+            st.bar_chart(
+                {
+                    'Risk Level': ['Low', 'Medium', 'High'],
+                    'Count': [risk_dist.get(level, 0) for level in ('Low', 'Medium', 'High')]
+                },
+                x='Risk Level',
+                y='Count'
+            )
         
         with col_chart2:
             st.markdown("**Distribution Breakdown:**")
@@ -123,12 +223,18 @@ def render_log_viewer():
     
     with col_action1:
         if st.button("🔄 Refresh Logs", use_container_width=True):
+            _cached_stats.clear()
+            _cached_predictions.clear()
+            _cached_alerts.clear()
+            _cached_prediction_table.clear()
+            _cached_alert_table.clear()
             st.rerun()
     
     with col_action3:
         st.info("💡 Database records are persistent. Use Analytics tab for data export.")
 
 
+@st.fragment
 def render_prediction_logs():
     """Render prediction logs table from database."""
     st.subheader("📋 Recent Predictions")
@@ -152,56 +258,20 @@ def render_prediction_logs():
     
     # Get filtered predictions from database
     risk_level = None if risk_filter == "All" else risk_filter
-    predictions = get_predictions(limit=limit, risk_level=risk_level)
+    predictions = _cached_predictions(limit, risk_level)
     
-    if predictions:
-        # Convert to DataFrame for display
-        df = pd.DataFrame(predictions)
-        
-        # Format columns
-        if 'timestamp' in df.columns:
-            df['timestamp'] = pd.to_datetime(df['timestamp']).dt.strftime('%Y-%m-%d %H:%M')
-        
-        if 'risk_probability' in df.columns:
-            df['risk_probability'] = df['risk_probability'].apply(lambda x: f"{x*100:.1f}%")
-        
-        if 'alert_generated' in df.columns:
-            df['alert_generated'] = df['alert_generated'].apply(lambda x: "✅ Yes" if x else "❌ No")
-        
-        # Select and rename columns for display (database uses user_name instead of user)
-        display_columns = ['timestamp', 'user_name', 'risk_level', 'risk_probability', 
-                          'alert_generated', 'symptom_count', 'condition_count']
-        display_columns = [c for c in display_columns if c in df.columns]
-        
-        column_names = {
-            'timestamp': 'Time',
-            'user_name': 'User',
-            'risk_level': 'Risk Level',
-            'risk_probability': 'Probability',
-            'alert_generated': 'Alert',
-            'symptom_count': 'Symptoms',
-            'condition_count': 'Conditions'
-        }
-        
-        df_display = df[display_columns].rename(columns=column_names)
-        
-        # Add color coding for risk level
-        def highlight_risk(row):
-            colors = {
-                'Low': 'background-color: #d4edda',
-                'Medium': 'background-color: #fff3cd',
-                'High': 'background-color: #f8d7da'
-            }
-            risk = row.get('Risk Level', 'Low')
-            return [colors.get(risk, '')] * len(row)
-        
+    count = len(predictions['timestamp'])
+    
+    if count:
+        table = _cached_prediction_table(limit, risk_level)
         st.dataframe(
-            df_display.style.apply(highlight_risk, axis=1),
+            table,
+            column_config=_PREDICTION_COLUMN_CONFIG,
             use_container_width=True,
             hide_index=True
         )
         
-        st.caption(f"Showing {len(df_display)} of {len(predictions)} entries")
+        st.caption(f"Showing {count} of {count} entries")
     else:
         st.info("📭 No prediction logs found")
 
@@ -210,36 +280,13 @@ def render_alert_logs():
     """Render alert logs table from database."""
     st.subheader("🚨 Recent Alerts")
     
-    alerts = get_alerts(limit=50)
+    alerts = _cached_alerts(50)
     
-    if alerts:
-        df = pd.DataFrame(alerts)
-        
-        # Format columns
-        if 'timestamp' in df.columns:
-            df['timestamp'] = pd.to_datetime(df['timestamp']).dt.strftime('%Y-%m-%d %H:%M')
-        
-        if 'recommendations' in df.columns:
-            df['recommendations'] = df['recommendations'].apply(
-                lambda x: f"{len(x)} recommendations" if isinstance(x, list) else "N/A"
-            )
-        
-        # Select columns for display (database uses user_name instead of user)
-        display_columns = ['timestamp', 'user_name', 'risk_level', 'alert_message']
-        display_columns = [c for c in display_columns if c in df.columns]
-        
-        column_names = {
-            'timestamp': 'Time',
-            'user_name': 'User',
-            'risk_level': 'Risk Level',
-            'alert_message': 'Alert Message'
-        }
-        
-        df_display = df[display_columns].rename(columns=column_names)
-        
-        st.dataframe(df_display, use_container_width=True, hide_index=True)
+    if alerts['timestamp']:
+        table = _cached_alert_table(50)
+        st.dataframe(table, use_container_width=True, hide_index=True)
         
-        st.caption(f"Showing {len(df_display)} alerts")
+        st.caption(f"Showing {len(table)} alerts")
     else:
         st.info("📭 No alert logs found")
 
@@ -5,14 +5,11 @@ Provides the login interface for user authentication.
 """
 
 import streamlit as st
-import sys
 import requests
 from streamlit_lottie import st_lottie
 from pathlib import Path
 import json
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-
 from app.auth import (
     authenticate, 
     login_user, 
@@ -23,40 +20,13 @@ from app.auth import (
 from cdss_config import UI_STYLE
 
 
-def load_lottieurl(url: str):
-    """Load Lottie animation from URL."""
-    try:
-        r = requests.get(url)
-        if r.status_code != 200:
-            return None
-        return r.json()
-    except:
-        return None
-
+# Shared keep-alive session for remote Lottie fallbacks; short timeout so a
+# slow CDN cannot stall the page
+_HTTP = requests.Session()
+_LOTTIE_TIMEOUT = 2
 
-def load_lottiefile(filepath: str):
-    """Load Lottie animation from local JSON file."""
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        st.error(f"Error loading local Lottie file: {e}")
-        return None
-
-
-def render_login_page() -> bool:
-    """
-    Render the login page with enhanced animations and healthcare theming.
-    
-    Returns:
-        True if login was successful, False otherwise
-    """
-    # Initialize session state for login animation
-    if 'login_error' not in st.session_state:
-        st.session_state.login_error = False
-    
-    # Enhanced CSS with animated gradient background, shake effect, and success animation
-    st.markdown(f"""
+# Login page styles, with UI_STYLE values resolved once at import
+_LOGIN_CSS = f"""
     <style>
     @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&family=Inter:wght@300;400;500;600&display=swap');
 
@@ -237,7 +207,46 @@ def render_login_page() -> bool:
     
     <!-- Animated gradient background -->
     <div class="login-bg"></div>
-    """, unsafe_allow_html=True)
+"""
+
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def load_lottieurl(url: str):
+    """Load Lottie animation from URL (cached; failed fetches retry hourly)."""
+    try:
+        r = _HTTP.get(url, timeout=_LOTTIE_TIMEOUT)
+        if r.status_code != 200:
+            return None
+        return r.json()
+    except:
+        return None
+
+
+@st.cache_data(show_spinner=False)
+def load_lottiefile(filepath: str):
+    """Load Lottie animation from local JSON file (parsed once per process)."""
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        st.error(f"Error loading local Lottie file: {e}")
+        return None
+
+
+def render_login_page() -> bool:
+    """
+    Render the login page with enhanced animations and healthcare theming.
+    
+    Returns:
+        True if login was successful, False otherwise
+    """
+    # Initialize session state for login animation
+    if 'login_error' not in st.session_state:
+        st.session_state.login_error = False
+    
+    # Enhanced CSS with animated gradient background, shake effect, and success animation.
+    # Streamlit drops elements a rerun does not re-emit, so the (prebuilt) block is sent every run.
+    st.markdown(_LOGIN_CSS, unsafe_allow_html=True)
     
     # Center the login form
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -6,22 +6,80 @@ with interactive visualizations and recommendations.
 """
 
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
-from typing import Dict, Optional
-import sys
-from pathlib import Path
+from functools import lru_cache
+from typing import Dict, Optional, TYPE_CHECKING
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from cdss_config import MULTI_RISK_CONFIG
 
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
-def render_multi_risk_dashboard(assessment):
+
+# Header card colours and icon per overall risk level
+_RISK_HEADER_STYLES = {
+    "Low": {"bg": "#d4edda", "text": "#155724", "icon": "✅"},
+    "Medium": {"bg": "#fff3cd", "text": "#856404", "icon": "⚠️"},
+    "High": {"bg": "#f8d7da", "text": "#721c24", "icon": "🚨"}
+}
+
+# (border, background) per risk level for the breakdown cards; anything else is styled as Low
+_CARD_STYLE_LOW = ("#28a745", "#f0fff4")
+_CARD_STYLE_BY_LEVEL = {
+    "High": ("#dc3545", "#fff5f5"),
+    "Medium": ("#ffc107", "#fffbeb"),
+    "Low": _CARD_STYLE_LOW
+}
+
+# Accent colour and icon per overall risk level for the compact summary
+_COMPACT_COLORS = {"Low": "#28a745", "Medium": "#ffc107", "High": "#dc3545"}
+_COMPACT_ICONS = {"Low": "✅", "Medium": "⚠️", "High": "🚨"}
+
+# Confidence line plus bar for the detailed analysis, filled by str.format
+_CONFIDENCE_TEMPLATE = (
+    "<p><strong>Prediction Confidence:</strong> {pct:.0f}%</p>"
+    '<div style="background: #e0e0e0; border-radius: 4px; height: 8px; overflow: hidden;">'
+    '<div style="background: #3498db; width: {pct:.1f}%; height: 100%;"></div>'
+    "</div>"
+)
+
+# Radar chart layout; the polar axis and legend never depend on the patient
+_RADAR_LAYOUT = dict(
+    polar=dict(
+        radialaxis=dict(
+            visible=True,
+            range=[0, 100],
+            ticksuffix='%'
+        )
+    ),
+    showlegend=True,
+    legend=dict(orientation='h', yanchor='bottom', y=-0.2),
+    height=350,
+    margin=dict(l=60, r=60, t=40, b=60)
+)
+
+
+def _top_unique(items, k: int) -> list:
+    """First k distinct items in order, stopping as soon as k have been seen."""
+    found = {}
+    for item in items:
+        found[item] = None
+        if len(found) >= k:
+            break
+    return list(found)
+
+
+def _bullet_list(items) -> str:
+    """Markdown bullet list, so a whole list is emitted as one element."""
+    return "\n".join(f"- {item}" for item in items)
+
+
+def render_multi_risk_dashboard(assessment, key: str = "multi_risk"):
     """
     Render the complete multi-risk dashboard.
     
     Args:
         assessment: MultiRiskAssessment object from the multi-risk engine
+        key: Widget key prefix, unique per dashboard shown in the same run
     """
     st.markdown("## 🎯 Multi-Risk Assessment Dashboard")
     
@@ -42,33 +100,17 @@ def render_multi_risk_dashboard(assessment):
     st.markdown("---")
     
     # Detailed analysis
-    render_detailed_analysis(assessment)
+    render_detailed_analysis(assessment, key=f"{key}_details")
     
     # Recommendations
     render_recommendations(assessment)
 
 
-def render_overall_risk_header(assessment):
-    """
-    Render the overall risk summary header.
-    
-    Args:
-        assessment: MultiRiskAssessment object
-    """
-    level = assessment.overall_risk_level
-    score = assessment.overall_risk_score
-    
-    # Color coding
-    colors = {
-        "Low": {"bg": "#d4edda", "text": "#155724", "icon": "✅"},
-        "Medium": {"bg": "#fff3cd", "text": "#856404", "icon": "⚠️"},
-        "High": {"bg": "#f8d7da", "text": "#721c24", "icon": "🚨"}
-    }
-    
-    style = colors.get(level, colors["Medium"])
-    
-    # Header card
-    st.markdown(f"""
+@lru_cache(maxsize=64)
+def _overall_header_html(level: str, score_permille: int) -> str:
+    """Header card HTML for a risk level and a score in tenths of a percent."""
+    style = _RISK_HEADER_STYLES.get(level, _RISK_HEADER_STYLES["Medium"])
+    return f"""
     <div style="
         background: {style['bg']};
         border-radius: 10px;
@@ -80,10 +122,26 @@ def render_overall_risk_header(assessment):
             {style['icon']} Overall Risk: {level.upper()}
         </h2>
         <p style="color: {style['text']}; font-size: 1.2em; margin: 10px 0 0 0;">
-            Combined Risk Score: {score*100:.1f}%
+            Combined Risk Score: {score_permille / 10:.1f}%
         </p>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+
+def render_overall_risk_header(assessment):
+    """
+    Render the overall risk summary header.
+    
+    Args:
+        assessment: MultiRiskAssessment object
+    """
+    # Header card
+    st.markdown(
+        _overall_header_html(
+            assessment.overall_risk_level, round(assessment.overall_risk_score * 1000)
+        ),
+        unsafe_allow_html=True
+    )
     
     # Summary message
     if assessment.requires_immediate_attention:
@@ -108,60 +166,48 @@ def render_risk_radar_chart(assessment):
     # Prepare data
     categories = []
     values = []
-    colors_list = []
     
     for risk_type, result in assessment.risk_results.items():
         config = MULTI_RISK_CONFIG['risk_types'].get(risk_type, {})
         categories.append(config.get('display_name', risk_type))
-        values.append(result.risk_score * 100)
-        colors_list.append(config.get('color', '#6c757d'))
-    
-    # Close the radar
-    categories_closed = categories + [categories[0]]
-    values_closed = values + [values[0]]
+        values.append(round(result.risk_score * 100, 1))
     
-    # Create radar chart
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatterpolar(
-        r=values_closed,
-        theta=categories_closed,
-        fill='toself',
-        fillcolor='rgba(52, 152, 219, 0.3)',
-        line=dict(color='#3498db', width=2),
-        name='Risk Score'
-    ))
-    
-    # Add threshold lines
-    fig.add_trace(go.Scatterpolar(
-        r=[30] * len(categories_closed),
-        theta=categories_closed,
-        line=dict(color='#28a745', width=1, dash='dot'),
-        name='Low Threshold'
-    ))
-    
-    fig.add_trace(go.Scatterpolar(
-        r=[60] * len(categories_closed),
-        theta=categories_closed,
-        line=dict(color='#ffc107', width=1, dash='dot'),
-        name='Medium Threshold'
-    ))
+    st.plotly_chart(_build_risk_radar(tuple(categories), tuple(values)), use_container_width=True)
+
+
+@st.cache_resource(max_entries=128, show_spinner=False)
+def _build_risk_radar(categories: tuple, values: tuple) -> "go.Figure":
+    """Build the risk profile radar chart from percentage scores rounded to 0.1."""
+    import plotly.graph_objects as go
     
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 100],
-                ticksuffix='%'
-            )
+    # Close the radar
+    categories_closed = list(categories) + [categories[0]]
+    values_closed = list(values) + [values[0]]
+    
+    traces = [
+        go.Scatterpolar(
+            r=values_closed,
+            theta=categories_closed,
+            fill='toself',
+            fillcolor='rgba(52, 152, 219, 0.3)',
+            line=dict(color='#3498db', width=2),
+            name='Risk Score'
         ),
-        showlegend=True,
-        legend=dict(orientation='h', yanchor='bottom', y=-0.2),
-        height=350,
-        margin=dict(l=60, r=60, t=40, b=60)
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+        # Threshold lines
+        go.Scatterpolar(
+            r=[30] * len(categories_closed),
+            theta=categories_closed,
+            line=dict(color='#28a745', width=1, dash='dot'),
+            name='Low Threshold'
+        ),
+        go.Scatterpolar(
+            r=[60] * len(categories_closed),
+            theta=categories_closed,
+            line=dict(color='#ffc107', width=1, dash='dot'),
+            name='Medium Threshold'
+        )
+    ]
+    return go.Figure(data=traces, layout=_RADAR_LAYOUT)
 
 
 def render_risk_cards(assessment):
@@ -173,96 +219,96 @@ def render_risk_cards(assessment):
     """
     st.markdown("### 📋 Risk Breakdown")
     
+    # One markdown element for all cards instead of one per risk type
+    cards = []
     for risk_type, result in assessment.risk_results.items():
         config = MULTI_RISK_CONFIG['risk_types'].get(risk_type, {})
         
-        # Determine card styling
-        if result.risk_level == "High":
-            border_color = "#dc3545"
-            bg_color = "#fff5f5"
-        elif result.risk_level == "Medium":
-            border_color = "#ffc107"
-            bg_color = "#fffbeb"
-        else:
-            border_color = "#28a745"
-            bg_color = "#f0fff4"
+        border_color, bg_color = _CARD_STYLE_BY_LEVEL.get(result.risk_level, _CARD_STYLE_LOW)
         
-        with st.container():
-            st.markdown(f"""
-            <div style="
-                border-left: 4px solid {border_color};
-                background: {bg_color};
-                padding: 12px 16px;
-                margin-bottom: 10px;
-                border-radius: 0 8px 8px 0;
-            ">
-                <div style="display: flex; justify-content: space-between; align-items: center;">
-                    <span style="font-size: 1.1em;">
-                        {config.get('icon', '⚠️')} <strong>{config.get('display_name', risk_type)}</strong>
-                    </span>
-                    <span style="
-                        background: {border_color};
-                        color: white;
-                        padding: 2px 10px;
-                        border-radius: 12px;
-                        font-size: 0.85em;
-                    ">
-                        {result.risk_level}
-                    </span>
-                </div>
-                <div style="margin-top: 8px;">
+        cards.append(f"""
+        <div style="
+            border-left: 4px solid {border_color};
+            background: {bg_color};
+            padding: 12px 16px;
+            margin-bottom: 10px;
+            border-radius: 0 8px 8px 0;
+        ">
+            <div style="display: flex; justify-content: space-between; align-items: center;">
+                <span style="font-size: 1.1em;">
+                    {config.get('icon', '⚠️')} <strong>{config.get('display_name', risk_type)}</strong>
+                </span>
+                <span style="
+                    background: {border_color};
+                    color: white;
+                    padding: 2px 10px;
+                    border-radius: 12px;
+                    font-size: 0.85em;
+                ">
+                    {result.risk_level}
+                </span>
+            </div>
+            <div style="margin-top: 8px;">
+                <div style="
+                    background: #e0e0e0;
+                    border-radius: 4px;
+                    height: 8px;
+                    overflow: hidden;
+                ">
                     <div style="
-                        background: #e0e0e0;
-                        border-radius: 4px;
-                        height: 8px;
-                        overflow: hidden;
-                    ">
-                        <div style="
-                            background: {border_color};
-                            width: {result.risk_score * 100}%;
-                            height: 100%;
-                        "></div>
-                    </div>
-                    <small style="color: #666;">Score: {result.risk_score*100:.1f}%</small>
+                        background: {border_color};
+                        width: {result.risk_score * 100}%;
+                        height: 100%;
+                    "></div>
                 </div>
+                <small style="color: #666;">Score: {result.risk_score*100:.1f}%</small>
             </div>
-            """, unsafe_allow_html=True)
+        </div>
+        """)
+    
+    st.markdown("".join(cards), unsafe_allow_html=True)
 
 
-def render_detailed_analysis(assessment):
+@st.fragment
+def render_detailed_analysis(assessment, key: str = "multi_risk_details"):
     """
     Render detailed analysis with expandable sections.
     
+    The per-risk sections are only built once the user switches them on;
+    the toggle reruns just this fragment.
+    
     Args:
         assessment: MultiRiskAssessment object
+        key: Widget key for the show/hide toggle
     """
     st.markdown("### 🔍 Detailed Analysis")
     
+    if not st.toggle("Show per-risk analysis", key=key):
+        return
+    
     for risk_type, result in assessment.risk_results.items():
         config = MULTI_RISK_CONFIG['risk_types'].get(risk_type, {})
         
         with st.expander(f"{config.get('icon', '⚠️')} {config.get('display_name', risk_type)} Analysis"):
             col1, col2 = st.columns([1, 1])
             
-            with col1:
-                st.markdown("**Contributing Factors:**")
-                if result.contributing_factors:
-                    for factor in result.contributing_factors:
-                        st.markdown(f"- {factor}")
-                else:
-                    st.markdown("_No significant risk factors identified_")
+            factors = (
+                _bullet_list(result.contributing_factors) if result.contributing_factors
+                else "_No significant risk factors identified_"
+            )
+            col1.markdown(f"**Contributing Factors:**\n\n{factors}")
             
-            with col2:
-                st.markdown("**Recommendations:**")
-                if result.recommendations:
-                    for rec in result.recommendations:
-                        st.markdown(f"- {rec}")
-                else:
-                    st.markdown("_Continue standard care protocol_")
+            recommendations = (
+                _bullet_list(result.recommendations) if result.recommendations
+                else "_Continue standard care protocol_"
+            )
+            col2.markdown(f"**Recommendations:**\n\n{recommendations}")
             
-            # Confidence indicator
-            st.markdown(f"**Prediction Confidence:** {result.confidence*100:.0f}%")
-            st.progress(result.confidence)
+            # Confidence indicator, drawn as static HTML rather than a progress widget
+            st.markdown(
+                _CONFIDENCE_TEMPLATE.format(pct=result.confidence * 100),
+                unsafe_allow_html=True
+            )
 
 
 def render_recommendations(assessment):
@@ -274,42 +320,33 @@ def render_recommendations(assessment):
     """
     st.markdown("### 📝 Action Recommendations")
     
-    # Prioritize by risk level
-    high_risk_recs = []
-    medium_risk_recs = []
-    low_risk_recs = []
-    
-    for result in assessment.risk_results.values():
-        if result.risk_level == "High":
-            high_risk_recs.extend(result.recommendations)
-        elif result.risk_level == "Medium":
-            medium_risk_recs.extend(result.recommendations)
-        else:
-            low_risk_recs.extend(result.recommendations)
-    
-    # Remove duplicates while preserving order
-    def dedupe(lst):
-        seen = set()
-        return [x for x in lst if not (x in seen or seen.add(x))]
-    
-    high_risk_recs = dedupe(high_risk_recs)
-    medium_risk_recs = dedupe(medium_risk_recs)
-    low_risk_recs = dedupe(low_risk_recs)
+    # Prioritize by risk level (anything not High/Medium counts as Low),
+    # collecting only as many distinct recommendations as are shown
+    results = assessment.risk_results.values()
+    high_risk_recs = _top_unique(
+        (rec for r in results if r.risk_level == "High" for rec in r.recommendations), 5
+    )
+    medium_risk_recs = _top_unique(
+        (rec for r in results if r.risk_level == "Medium" for rec in r.recommendations), 5
+    )
     
     if high_risk_recs:
         st.error("🚨 **Priority Actions:**")
-        for rec in high_risk_recs[:5]:  # Limit to top 5
-            st.markdown(f"- {rec}")
+        st.markdown(_bullet_list(high_risk_recs))
     
     if medium_risk_recs:
         st.warning("⚠️ **Recommended Actions:**")
-        for rec in medium_risk_recs[:5]:
-            st.markdown(f"- {rec}")
+        st.markdown(_bullet_list(medium_risk_recs))
+    
+    if high_risk_recs or medium_risk_recs:
+        return
     
-    if low_risk_recs and not (high_risk_recs or medium_risk_recs):
+    low_risk_recs = _top_unique(
+        (rec for r in results if r.risk_level not in ("High", "Medium") for rec in r.recommendations), 3
+    )
+    if low_risk_recs:
         st.success("✅ **Routine Actions:**")
-        for rec in low_risk_recs[:3]:
-            st.markdown(f"- {rec}")
+        st.markdown(_bullet_list(low_risk_recs))
 
 
 def render_risk_comparison_chart(assessment):
@@ -329,7 +366,7 @@ def render_risk_comparison_chart(assessment):
     for risk_type, result in assessment.risk_results.items():
         config = MULTI_RISK_CONFIG['risk_types'].get(risk_type, {})
         names.append(config.get('display_name', risk_type))
-        scores.append(result.risk_score * 100)
+        scores.append(round(result.risk_score * 100, 1))
         
         if result.risk_level == "High":
             colors.append('#dc3545')
@@ -338,19 +375,28 @@ def render_risk_comparison_chart(assessment):
         else:
             colors.append('#28a745')
     
-    fig = px.bar(
-        x=names,
-        y=scores,
-        color=names,
-        color_discrete_sequence=colors,
-        labels={'x': 'Risk Type', 'y': 'Risk Score (%)'},
-        title='Risk Comparison'
+    st.plotly_chart(
+        _build_risk_comparison(tuple(names), tuple(scores), tuple(colors)),
+        use_container_width=True,
+        key="risk-comparison"
     )
+
+
+@st.cache_resource(max_entries=128, show_spinner=False)
+def _build_risk_comparison(names: tuple, scores: tuple, colors: tuple) -> "go.Figure":
+    """Build the risk comparison bar chart from percentage scores rounded to 0.1."""
+    import plotly.graph_objects as go
+    
+    fig = go.Figure(go.Bar(x=list(names), y=list(scores), marker_color=list(colors)))
     
     fig.update_layout(
+        title='Risk Comparison',
+        xaxis_title='Risk Type',
+        yaxis_title='Risk Score (%)',
         showlegend=False,
         height=300,
-        yaxis_range=[0, 100]
+        yaxis_range=[0, 100],
+        uirevision="risk-dashboard"
     )
     
     # Add threshold lines
@@ -358,34 +404,40 @@ def render_risk_comparison_chart(assessment):
                   annotation_text="Low threshold")
     fig.add_hline(y=60, line_dash="dot", line_color="#ffc107",
                   annotation_text="Medium threshold")
-    
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
-def render_compact_risk_summary(assessment):
-    """
-    Render a compact summary suitable for sidebar or header.
-    
-    Args:
-        assessment: MultiRiskAssessment object
-    """
-    level = assessment.overall_risk_level
-    
-    colors = {"Low": "#28a745", "Medium": "#ffc107", "High": "#dc3545"}
-    icons = {"Low": "✅", "Medium": "⚠️", "High": "🚨"}
-    
-    st.markdown(f"""
+@lru_cache(maxsize=64)
+def _compact_summary_html(level: str, score_pct: int) -> str:
+    """Compact summary HTML for a risk level and a whole-percent score."""
+    color = _COMPACT_COLORS.get(level, '#6c757d')
+    return f"""
     <div style="
-        background: linear-gradient(135deg, {colors.get(level, '#6c757d')}22, white);
-        border: 2px solid {colors.get(level, '#6c757d')};
+        background: linear-gradient(135deg, {color}22, white);
+        border: 2px solid {color};
         border-radius: 8px;
         padding: 10px;
         text-align: center;
     ">
-        <span style="font-size: 1.5em;">{icons.get(level, '⚠️')}</span>
-        <p style="margin: 5px 0 0 0; font-weight: bold; color: {colors.get(level, '#6c757d')};">
+        <span style="font-size: 1.5em;">{_COMPACT_ICONS.get(level, '⚠️')}</span>
+        <p style="margin: 5px 0 0 0; font-weight: bold; color: {color};">
             {level} Risk
         </p>
-        <small>{assessment.overall_risk_score*100:.0f}% combined score</small>
+        <small>{score_pct}% combined score</small>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+
+def render_compact_risk_summary(assessment):
+    """
+    Render a compact summary suitable for sidebar or header.
+    
+    Args:
+        assessment: MultiRiskAssessment object
+    """
+    st.markdown(
+        _compact_summary_html(
+            assessment.overall_risk_level, round(assessment.overall_risk_score * 100)
+        ),
+        unsafe_allow_html=True
+    )
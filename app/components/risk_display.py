@@ -6,25 +6,43 @@ gauges, and probability charts.
 """
 
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from typing import Dict, Optional
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from typing import Dict, Optional, TYPE_CHECKING
+
 from cdss_config import RISK_COLORS, UI_STYLE
 
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
-def render_risk_gauge(risk_score: float, risk_label: str) -> None:
-    """
-    Render a gauge chart showing the risk score.
+
+# Shared Plotly uirevision so the browser updates charts in place across reruns
+_UI_REVISION = "risk-dashboard"
+
+# Emoji and explanation based on risk level
+_RISK_BADGE_INFO = {
+    "Low": {
+        "emoji": "🟢",
+        "explanation": "The patient's clinical indicators suggest a low probability of medical errors. Standard care protocols are appropriate.",
+        "css_class": "risk-low"
+    },
+    "Medium": {
+        "emoji": "🟡", 
+        "explanation": "Some clinical factors indicate moderate risk. Consider additional review before finalizing treatment decisions.",
+        "css_class": "risk-medium"
+    },
+    "High": {
+        "emoji": "🔴",
+        "explanation": "Multiple risk factors detected. Careful clinical review recommended before proceeding with treatment.",
+        "css_class": "risk-high"
+    }
+}
+_UNKNOWN_RISK_INFO = {"emoji": "❓", "explanation": "Unable to determine risk level.", "css_class": ""}
+
+
+@st.cache_resource(max_entries=128, show_spinner=False)
+def _build_risk_gauge(risk_score: float, risk_label: str) -> "go.Figure":
+    """Build the risk score gauge; callers round the score to 0.1% (3 decimals) first."""
+    import plotly.graph_objects as go
     
-    Args:
-        risk_score: Risk score between 0 and 1
-        risk_label: Risk label (Low, Medium, High)
-    """
     color = RISK_COLORS.get(risk_label, "#6c757d")
     
     fig = go.Figure(go.Indicator(
@@ -56,10 +74,28 @@ def render_risk_gauge(risk_score: float, risk_label: str) -> None:
         height=250,
         margin=dict(l=20, r=20, t=40, b=20),
         paper_bgcolor="rgba(0,0,0,0)",
-        font={'color': "#333", 'family': "Arial"}
+        font={'color': "#333", 'family': "Arial"},
+        uirevision=_UI_REVISION
     )
+    return fig
+
+
+def render_risk_gauge(risk_score: float, risk_label: str) -> None:
+    """
+    Render a gauge chart showing the risk score.
+    
+    The score is drawn to 0.1% precision, so scores that differ by less
+    than that share one cached figure.
     
-    st.plotly_chart(fig, use_container_width=True)
+    Args:
+        risk_score: Risk score between 0 and 1
+        risk_label: Risk label (Low, Medium, High)
+    """
+    st.plotly_chart(
+        _build_risk_gauge(round(risk_score, 3), risk_label),
+        use_container_width=True,
+        key="risk-gauge"
+    )
 
 
 def render_risk_badge(risk_label: str, confidence: float) -> None:
@@ -72,26 +108,7 @@ def render_risk_badge(risk_label: str, confidence: float) -> None:
     """
     color = RISK_COLORS.get(risk_label, "#6c757d")
     
-    # Emoji and explanation based on risk level
-    risk_info = {
-        "Low": {
-            "emoji": "🟢",
-            "explanation": "The patient's clinical indicators suggest a low probability of medical errors. Standard care protocols are appropriate.",
-            "css_class": "risk-low"
-        },
-        "Medium": {
-            "emoji": "🟡", 
-            "explanation": "Some clinical factors indicate moderate risk. Consider additional review before finalizing treatment decisions.",
-            "css_class": "risk-medium"
-        },
-        "High": {
-            "emoji": "🔴",
-            "explanation": "Multiple risk factors detected. Careful clinical review recommended before proceeding with treatment.",
-            "css_class": "risk-high"
-        }
-    }
-    
-    info = risk_info.get(risk_label, {"emoji": "❓", "explanation": "Unable to determine risk level.", "css_class": ""})
+    info = _RISK_BADGE_INFO.get(risk_label, _UNKNOWN_RISK_INFO)
     css_class = info.get("css_class", "")
     
     st.markdown(f"""
@@ -126,21 +143,17 @@ def render_risk_badge(risk_label: str, confidence: float) -> None:
     """, unsafe_allow_html=True)
 
 
-def render_probability_chart(probabilities: Dict[str, float]) -> None:
-    """
-    Render a bar chart showing probabilities for each risk level.
-    
-    Args:
-        probabilities: Dictionary with risk level probabilities
-    """
-    st.subheader("📊 Risk Probability Distribution")
+@st.cache_resource(max_entries=128, show_spinner=False)
+def _build_probability_chart(items: tuple) -> "go.Figure":
+    """Build the probability bar chart from (risk level, probability) pairs rounded to 0.1%."""
+    import plotly.graph_objects as go
     
     fig = go.Figure(data=[
         go.Bar(
-            x=list(probabilities.keys()),
-            y=[v * 100 for v in probabilities.values()],
-            marker_color=[RISK_COLORS.get(k, "#6c757d") for k in probabilities.keys()],
-            text=[f"{v*100:.1f}%" for v in probabilities.values()],
+            x=[k for k, _ in items],
+            y=[v * 100 for _, v in items],
+            marker_color=[RISK_COLORS.get(k, "#6c757d") for k, _ in items],
+            text=[f"{v*100:.1f}%" for _, v in items],
             textposition='auto',
         )
     ])
@@ -151,27 +164,37 @@ def render_probability_chart(probabilities: Dict[str, float]) -> None:
         yaxis_range=[0, 100],
         height=300,
         margin=dict(l=20, r=20, t=20, b=40),
-        showlegend=False
+        showlegend=False,
+        uirevision=_UI_REVISION
     )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
-def render_feature_importance(importance_dict: Dict[str, float], top_n: int = 10) -> None:
+def render_probability_chart(probabilities: Dict[str, float]) -> None:
     """
-    Render feature importance chart.
+    Render a bar chart showing probabilities for each risk level.
+    
+    Probabilities are drawn to 0.1% precision, matching the bar labels.
     
     Args:
-        importance_dict: Dictionary of feature names to importance scores
-        top_n: Number of top features to display
+        probabilities: Dictionary with risk level probabilities
     """
-    if not importance_dict:
-        return
-        
-    st.subheader("🔍 Key Contributing Factors")
+    st.subheader("📊 Risk Probability Distribution")
+    
+    st.plotly_chart(
+        _build_probability_chart(tuple((k, round(v, 3)) for k, v in probabilities.items())),
+        use_container_width=True,
+        key="risk-probability"
+    )
+
+
+@st.cache_resource(max_entries=128, show_spinner=False)
+def _build_feature_importance(items: tuple, top_n: int) -> "go.Figure":
+    """Build the top-N feature importance bar chart from (feature, score) pairs rounded to 0.1%."""
+    import plotly.graph_objects as go
     
     # Sort and get top features
-    sorted_features = sorted(importance_dict.items(), key=lambda x: x[1], reverse=True)[:top_n]
+    sorted_features = sorted(items, key=lambda x: x[1], reverse=True)[:top_n]
     features, importances = zip(*sorted_features)
     
     fig = go.Figure(data=[
@@ -192,8 +215,26 @@ def render_feature_importance(importance_dict: Dict[str, float], top_n: int = 10
         margin=dict(l=20, r=60, t=20, b=40),
         yaxis={'categoryorder': 'total ascending'}
     )
+    return fig
+
+
+def render_feature_importance(importance_dict: Dict[str, float], top_n: int = 10) -> None:
+    """
+    Render feature importance chart.
     
-    st.plotly_chart(fig, use_container_width=True)
+    Args:
+        importance_dict: Dictionary of feature names to importance scores
+        top_n: Number of top features to display
+    """
+    if not importance_dict:
+        return
+        
+    st.subheader("🔍 Key Contributing Factors")
+    
+    st.plotly_chart(
+        _build_feature_importance(tuple((k, round(v, 3)) for k, v in importance_dict.items()), top_n),
+        use_container_width=True
+    )
 
 
 def render_risk_summary(assessment_summary: Dict) -> None:
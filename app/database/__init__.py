@@ -8,12 +8,15 @@ from app.database.db import (
     save_prediction,
     save_alert,
     get_predictions,
+    get_predictions_columnar,
     get_alerts,
+    get_alerts_columnar,
     get_statistics,
     get_prediction_trends,
     export_predictions_csv,
     export_predictions_excel,
-    get_total_records
+    get_total_records,
+    get_latest_timestamp
 )
 
 __all__ = [
@@ -22,10 +25,13 @@ __all__ = [
     'save_prediction',
     'save_alert',
     'get_predictions',
+    'get_predictions_columnar',
     'get_alerts',
+    'get_alerts_columnar',
     'get_statistics',
     'get_prediction_trends',
     'export_predictions_csv',
     'export_predictions_excel',
-    'get_total_records'
+    'get_total_records',
+    'get_latest_timestamp'
 ]
@@ -9,7 +9,7 @@ import os
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence
 from contextlib import contextmanager
 import threading
 
@@ -30,6 +30,23 @@ else:
     # SQLite database file location
     DB_PATH = Path(__file__).parent.parent.parent / "data" / "cdss.db"
 
+# Columns of the predictions table (valid values for get_predictions(columns=...))
+PREDICTION_COLUMNS = frozenset({
+    'id', 'timestamp', 'patient_id', 'doctor_id', 'user_name', 'user_role',
+    'risk_level', 'risk_probability', 'alert_generated', 'alert_type',
+    'heart_rate', 'blood_pressure_systolic', 'blood_pressure_diastolic',
+    'temperature', 'oxygen_saturation', 'respiratory_rate', 'blood_sugar',
+    'pain_score', 'consciousness_gcs', 'bmi', 'symptom_count',
+    'condition_count', 'symptoms', 'conditions'
+})
+
+# Columns of the alerts table (valid values for get_alerts_columnar(columns=...))
+ALERT_COLUMNS = frozenset({
+    'id', 'timestamp', 'prediction_id', 'user_name', 'risk_level',
+    'alert_message', 'recommendations', 'acknowledged', 'acknowledged_at',
+    'acknowledged_by'
+})
+
 # Thread-local storage for connections
 _local = threading.local()
 
@@ -139,6 +156,14 @@ def init_db() -> None:
             CREATE INDEX IF NOT EXISTS idx_predictions_doctor_id 
             ON predictions(doctor_id)
         ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_predictions_risk_timestamp 
+            ON predictions(risk_level, timestamp DESC)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_alerts_timestamp 
+            ON alerts(timestamp DESC)
+        ''')
         
     else:
         cursor = conn.cursor()
@@ -203,6 +228,14 @@ def init_db() -> None:
             CREATE INDEX IF NOT EXISTS idx_predictions_doctor_id 
             ON predictions(doctor_id)
         ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_predictions_risk_timestamp 
+            ON predictions(risk_level, timestamp DESC)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_alerts_timestamp 
+            ON alerts(timestamp DESC)
+        ''')
         
         # Migration: Add missing columns to existing databases
         try:
@@ -214,9 +247,99 @@ def init_db() -> None:
         except:
             pass  # Column already exists
     
+    _init_stats_summary(cursor)
+    
     conn.commit()
 
 
+def _init_stats_summary(cursor) -> None:
+    """
+    Create the stats_summary table and the triggers that keep it current.
+    
+    Rows are keyed by metric: 'predictions', 'alerts' and 'risk:<level>'.
+    The table is backfilled from the source tables the first time it is created.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stats_summary (
+            metric VARCHAR(50) PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    
+    if USE_POSTGRES:
+        cursor.execute('''
+            CREATE OR REPLACE FUNCTION cdss_update_stats_summary() RETURNS trigger AS $$
+            DECLARE
+                delta INTEGER := CASE WHEN TG_OP = 'INSERT' THEN 1 ELSE -1 END;
+                row_risk TEXT;
+            BEGIN
+                IF TG_OP = 'INSERT' THEN
+                    row_risk := NEW.risk_level;
+                ELSE
+                    row_risk := OLD.risk_level;
+                END IF;
+                INSERT INTO stats_summary (metric, count) VALUES (TG_TABLE_NAME, delta)
+                    ON CONFLICT (metric) DO UPDATE SET count = stats_summary.count + delta;
+                IF TG_TABLE_NAME = 'predictions' THEN
+                    INSERT INTO stats_summary (metric, count) VALUES ('risk:' || row_risk, delta)
+                        ON CONFLICT (metric) DO UPDATE SET count = stats_summary.count + delta;
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        ''')
+        for table in ('predictions', 'alerts'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS trg_{table}_stats ON {table}')
+            cursor.execute(f'''
+                CREATE TRIGGER trg_{table}_stats
+                AFTER INSERT OR DELETE ON {table}
+                FOR EACH ROW EXECUTE PROCEDURE cdss_update_stats_summary()
+            ''')
+    else:
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_predictions_stats_insert AFTER INSERT ON predictions
+            BEGIN
+                INSERT OR IGNORE INTO stats_summary (metric, count)
+                    VALUES ('predictions', 0), ('risk:' || NEW.risk_level, 0);
+                UPDATE stats_summary SET count = count + 1
+                    WHERE metric IN ('predictions', 'risk:' || NEW.risk_level);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_predictions_stats_delete AFTER DELETE ON predictions
+            BEGIN
+                UPDATE stats_summary SET count = count - 1
+                    WHERE metric IN ('predictions', 'risk:' || OLD.risk_level);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_alerts_stats_insert AFTER INSERT ON alerts
+            BEGIN
+                INSERT OR IGNORE INTO stats_summary (metric, count) VALUES ('alerts', 0);
+                UPDATE stats_summary SET count = count + 1 WHERE metric = 'alerts';
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_alerts_stats_delete AFTER DELETE ON alerts
+            BEGIN
+                UPDATE stats_summary SET count = count - 1 WHERE metric = 'alerts';
+            END
+        ''')
+    
+    # Backfill once, for databases that predate the summary table
+    cursor.execute("SELECT COUNT(*) AS count FROM stats_summary WHERE metric = 'predictions'")
+    if cursor.fetchone()[0] == 0:
+        cursor.execute("DELETE FROM stats_summary")
+        cursor.execute('''
+            INSERT INTO stats_summary (metric, count)
+            SELECT 'predictions', COUNT(*) FROM predictions
+            UNION ALL
+            SELECT 'alerts', COUNT(*) FROM alerts
+            UNION ALL
+            SELECT 'risk:' || risk_level, COUNT(*) FROM predictions GROUP BY risk_level
+        ''')
+
+
 def save_prediction(
     user: str,
     user_role: str,
@@ -370,36 +493,58 @@ def save_alert(
             return cursor.lastrowid
 
 
-def get_predictions(
-    limit: int = 100,
-    risk_level: Optional[str] = None,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    user: Optional[str] = None,
-    patient_id: Optional[str] = None,
-    doctor_id: Optional[str] = None
-) -> List[Dict[str, Any]]:
-    """
-    Get prediction records with optional filtering.
-    
-    Returns:
-        List of prediction dictionaries
-    """
+# SQL expression rendering a timestamp column as 'YYYY-MM-DD HH:MM'
+_TIMESTAMP_MINUTES_SQL = (
+    "to_char(timestamp, 'YYYY-MM-DD HH24:MI')" if USE_POSTGRES
+    else "strftime('%Y-%m-%d %H:%M', timestamp)"
+)
+
+
+def _select_list(columns: Sequence[str], format_timestamp: bool) -> str:
+    """Comma-separated SELECT list, optionally formatting the timestamp in SQL."""
+    if not format_timestamp:
+        return ', '.join(columns)
+    return ', '.join(
+        f"{_TIMESTAMP_MINUTES_SQL} AS timestamp" if column == 'timestamp' else column
+        for column in columns
+    )
+
+
+def _prediction_query(
+    limit: int,
+    risk_level: Optional[str],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    user: Optional[str],
+    patient_id: Optional[str],
+    doctor_id: Optional[str],
+    columns: Optional[Sequence[str]],
+    format_timestamp: bool = False
+) -> tuple:
+    """Build the filtered predictions SELECT; returns (query, params)."""
     params = []
     
+    if columns:
+        unknown = set(columns) - PREDICTION_COLUMNS
+        if unknown:
+            raise ValueError(f"Unknown prediction columns: {sorted(unknown)}")
+        select = f"SELECT {_select_list(columns, format_timestamp)} FROM predictions WHERE 1=1"
+    else:
+        select = "SELECT * FROM predictions WHERE 1=1"
+    
     if USE_POSTGRES:
-        query = "SELECT * FROM predictions WHERE 1=1"
+        query = select
         
         if risk_level:
             query += " AND risk_level = %s"
             params.append(risk_level)
         
         if start_date:
-            query += " AND timestamp >= %s"
+            query += " AND predictions.timestamp >= %s"
             params.append(start_date)
         
         if end_date:
-            query += " AND timestamp <= %s"
+            query += " AND predictions.timestamp <= %s"
             params.append(end_date)
         
         if user:
@@ -414,21 +559,21 @@ def get_predictions(
             query += " AND doctor_id = %s"
             params.append(doctor_id)
         
-        query += " ORDER BY timestamp DESC LIMIT %s"
+        query += " ORDER BY predictions.timestamp DESC LIMIT %s"
         params.append(limit)
     else:
-        query = "SELECT * FROM predictions WHERE 1=1"
+        query = select
         
         if risk_level:
             query += " AND risk_level = ?"
             params.append(risk_level)
         
         if start_date:
-            query += " AND timestamp >= ?"
+            query += " AND predictions.timestamp >= ?"
             params.append(start_date)
         
         if end_date:
-            query += " AND timestamp <= ?"
+            query += " AND predictions.timestamp <= ?"
             params.append(end_date)
         
         if user:
@@ -443,15 +588,109 @@ def get_predictions(
             query += " AND doctor_id = ?"
             params.append(doctor_id)
         
-        query += " ORDER BY timestamp DESC LIMIT ?"
+        query += " ORDER BY predictions.timestamp DESC LIMIT ?"
         params.append(limit)
     
+    return query, params
+
+
+def get_predictions(
+    limit: int = 100,
+    risk_level: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    user: Optional[str] = None,
+    patient_id: Optional[str] = None,
+    doctor_id: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Get prediction records with optional filtering.
+    
+    Args:
+        columns: Subset of prediction columns to select (default: all)
+    
+    Returns:
+        List of prediction dictionaries
+    """
+    query, params = _prediction_query(
+        limit, risk_level, start_date, end_date, user, patient_id, doctor_id, columns
+    )
+    
     with get_db_cursor() as cursor:
         cursor.execute(query, params)
         rows = cursor.fetchall()
         return [dict(row) for row in rows]
 
 
+def get_predictions_columnar(
+    limit: int = 100,
+    risk_level: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    user: Optional[str] = None,
+    patient_id: Optional[str] = None,
+    doctor_id: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+    format_timestamp: bool = False
+) -> Dict[str, List[Any]]:
+    """
+    Get prediction records as a column name -> values mapping.
+    
+    Takes the same filters as get_predictions; suited to building DataFrames
+    without a row-to-column transpose. With an explicit column list,
+    format_timestamp returns timestamps as 'YYYY-MM-DD HH:MM' strings.
+    """
+    query, params = _prediction_query(
+        limit, risk_level, start_date, end_date, user, patient_id, doctor_id, columns,
+        format_timestamp
+    )
+    
+    return _fetch_columnar(query, params)
+
+
+def _fetch_columnar(query: str, params: list) -> Dict[str, List[Any]]:
+    """Run a SELECT and return its result as column name -> values."""
+    with get_db_cursor() as cursor:
+        cursor.execute(query, params)
+        names = [desc[0] for desc in cursor.description]
+        rows = cursor.fetchall()
+    
+    if USE_POSTGRES:
+        # RealDictCursor rows are keyed by column name
+        return {name: [row[name] for row in rows] for name in names}
+    if not rows:
+        return {name: [] for name in names}
+    return dict(zip(names, map(list, zip(*rows))))
+
+
+def _alert_query(
+    limit: int,
+    acknowledged: Optional[bool],
+    columns: Optional[Sequence[str]] = None,
+    format_timestamp: bool = False
+) -> tuple:
+    """Build the recent-alerts SELECT; returns (query, params)."""
+    params = []
+    placeholder = '%s' if USE_POSTGRES else '?'
+    
+    if columns:
+        unknown = set(columns) - ALERT_COLUMNS
+        if unknown:
+            raise ValueError(f"Unknown alert columns: {sorted(unknown)}")
+        query = f"SELECT {_select_list(columns, format_timestamp)} FROM alerts WHERE 1=1"
+    else:
+        query = "SELECT * FROM alerts WHERE 1=1"
+    
+    if acknowledged is not None:
+        query += f" AND acknowledged = {placeholder}"
+        params.append(1 if acknowledged else 0)
+    query += f" ORDER BY alerts.timestamp DESC LIMIT {placeholder}"
+    params.append(limit)
+    
+    return query, params
+
+
 def get_alerts(
     limit: int = 50,
     acknowledged: Optional[bool] = None
@@ -459,22 +698,7 @@ def get_alerts(
     """
     Get alert records.
     """
-    params = []
-    
-    if USE_POSTGRES:
-        query = "SELECT * FROM alerts WHERE 1=1"
-        if acknowledged is not None:
-            query += " AND acknowledged = %s"
-            params.append(1 if acknowledged else 0)
-        query += " ORDER BY timestamp DESC LIMIT %s"
-        params.append(limit)
-    else:
-        query = "SELECT * FROM alerts WHERE 1=1"
-        if acknowledged is not None:
-            query += " AND acknowledged = ?"
-            params.append(1 if acknowledged else 0)
-        query += " ORDER BY timestamp DESC LIMIT ?"
-        params.append(limit)
+    query, params = _alert_query(limit, acknowledged)
     
     with get_db_cursor() as cursor:
         cursor.execute(query, params)
@@ -491,61 +715,57 @@ def get_alerts(
         return results
 
 
+def get_alerts_columnar(
+    limit: int = 50,
+    acknowledged: Optional[bool] = None,
+    columns: Optional[Sequence[str]] = None,
+    format_timestamp: bool = False
+) -> Dict[str, List[Any]]:
+    """
+    Get alert records as a column name -> values mapping.
+    
+    Recommendations are returned as stored (JSON text), not decoded. With an
+    explicit column list, format_timestamp returns 'YYYY-MM-DD HH:MM' strings.
+    """
+    return _fetch_columnar(*_alert_query(limit, acknowledged, columns, format_timestamp))
+
+
 def get_statistics() -> Dict[str, Any]:
     """
     Get summary statistics for the analytics dashboard.
     """
     with get_db_cursor() as cursor:
-        # Total predictions
-        cursor.execute("SELECT COUNT(*) as count FROM predictions")
-        result = cursor.fetchone()
-        total_predictions = result['count'] if USE_POSTGRES else result[0]
-        
-        # Predictions by risk level
-        cursor.execute('''
-            SELECT risk_level, COUNT(*) as count 
-            FROM predictions 
-            GROUP BY risk_level
-        ''')
-        if USE_POSTGRES:
-            risk_distribution = {row['risk_level']: row['count'] for row in cursor.fetchall()}
-        else:
-            risk_distribution = {row['risk_level']: row['count'] for row in cursor.fetchall()}
+        # Totals and risk distribution from the trigger-maintained summary table
+        cursor.execute("SELECT metric, count FROM stats_summary")
+        summary = {row['metric']: row['count'] for row in cursor.fetchall()}
+        total_predictions = summary.get('predictions', 0)
+        total_alerts = summary.get('alerts', 0)
+        risk_distribution = {
+            metric[len('risk:'):]: count
+            for metric, count in summary.items()
+            if metric.startswith('risk:') and count > 0
+        }
         
-        # Total alerts
-        cursor.execute("SELECT COUNT(*) as count FROM alerts")
+        # Today's and this week's predictions in one range scan over the timestamp index
+        now = datetime.now()
+        today = now.strftime('%Y-%m-%d')
+        tomorrow = (now + timedelta(days=1)).strftime('%Y-%m-%d')
+        week_ago = (now - timedelta(days=7)).strftime('%Y-%m-%d')
+        placeholder = '%s' if USE_POSTGRES else '?'
+        cursor.execute(
+            f"""
+            SELECT
+                COALESCE(SUM(CASE WHEN timestamp >= {placeholder} AND timestamp < {placeholder}
+                                  THEN 1 ELSE 0 END), 0) AS today_count,
+                COUNT(*) AS week_count
+            FROM predictions
+            WHERE timestamp >= {placeholder}
+            """,
+            (today, tomorrow, week_ago)
+        )
         result = cursor.fetchone()
-        total_alerts = result['count'] if USE_POSTGRES else result[0]
-        
-        # Today's predictions
-        today = datetime.now().strftime('%Y-%m-%d')
-        if USE_POSTGRES:
-            cursor.execute(
-                "SELECT COUNT(*) as count FROM predictions WHERE DATE(timestamp) = %s",
-                (today,)
-            )
-        else:
-            cursor.execute(
-                "SELECT COUNT(*) as count FROM predictions WHERE date(timestamp) = ?",
-                (today,)
-            )
-        result = cursor.fetchone()
-        today_predictions = result['count'] if USE_POSTGRES else result[0]
-        
-        # This week's predictions
-        week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-        if USE_POSTGRES:
-            cursor.execute(
-                "SELECT COUNT(*) as count FROM predictions WHERE DATE(timestamp) >= %s",
-                (week_ago,)
-            )
-        else:
-            cursor.execute(
-                "SELECT COUNT(*) as count FROM predictions WHERE date(timestamp) >= ?",
-                (week_ago,)
-            )
-        result = cursor.fetchone()
-        week_predictions = result['count'] if USE_POSTGRES else result[0]
+        today_predictions = result['today_count']
+        week_predictions = result['week_count']
         
         # High risk rate
         high_risk_count = risk_distribution.get('High', 0)
@@ -667,6 +887,15 @@ def get_total_records() -> int:
         return result['count'] if USE_POSTGRES else result[0]
 
 
+def get_latest_timestamp() -> Optional[str]:
+    """Return the timestamp of the most recent prediction record, if any."""
+    with get_db_cursor() as cursor:
+        cursor.execute("SELECT MAX(timestamp) as latest FROM predictions")
+        result = cursor.fetchone()
+        latest = result['latest'] if USE_POSTGRES else result[0]
+        return str(latest) if latest is not None else None
+
+
 # Initialize database on module import
 try:
     init_db()
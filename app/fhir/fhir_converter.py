@@ -9,6 +9,7 @@ import json
 from datetime import datetime, date
 from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 import sys
 
@@ -16,6 +17,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from cdss_config import FHIR_CONFIG, VITAL_SIGNS, SYMPTOMS_LIST, EXISTING_CONDITIONS
 
 
+@lru_cache(maxsize=256)
+def _parse_birth_date(value: str) -> date:
+    """Parse a FHIR birthDate string (memoized; sample bundles repeat the same values)."""
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
 @dataclass
 class FHIRPatientData:
     """Structured patient data extracted from FHIR resources."""
@@ -172,7 +179,7 @@ class FHIRConverter:
         birth_date_str = patient.get('birthDate')
         if birth_date_str:
             try:
-                birth_date = datetime.strptime(birth_date_str, '%Y-%m-%d').date()
+                birth_date = _parse_birth_date(birth_date_str)
                 result['birth_date'] = birth_date
                 today = date.today()
                 age = today.year - birth_date.year
@@ -10,9 +10,7 @@ import streamlit as st
 import sys
 from pathlib import Path
 import os
-import requests
 from streamlit_lottie import st_lottie
-import json
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
@@ -30,9 +28,15 @@ from app.components.risk_display import (
 from app.components.alert_component import (
     render_alert, 
     render_no_alert_message,
-    render_alert_fatigue_info
+    render_alert_fatigue_info,
+    reset_alert_css
+)
+from app.components.login_page import (
+    render_login_page,
+    render_user_info_sidebar,
+    load_lottiefile,
+    load_lottieurl
 )
-from app.components.login_page import render_login_page, render_user_info_sidebar
 from app.components.log_viewer import render_log_viewer
 from app.utils.validators import validate_patient_data, get_data_summary
 from app.utils.logger import get_logger, log_prediction, log_alert
@@ -52,27 +56,6 @@ from app.components.analytics_dashboard import render_analytics_dashboard
 from app.database import export_predictions_excel, get_total_records, save_prediction as db_save_prediction
 
 
-def load_lottieurl(url: str):
-    """Load Lottie animation from URL."""
-    try:
-        r = requests.get(url)
-        if r.status_code != 200:
-            return None
-        return r.json()
-    except:
-        return None
-
-
-def load_lottiefile(filepath: str):
-    """Load Lottie animation from local JSON file."""
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        st.error(f"Error loading local Lottie file: {e}")
-        return None
-
-
 def set_professional_style():
     """Inject global professional CSS styles."""
     st.markdown(f"""
@@ -301,6 +284,9 @@ def main():
     # Page configuration
     st.set_page_config(**PAGE_CONFIG)
     
+    # Component styles are re-emitted once per script run
+    reset_alert_css()
+    
     # Custom CSS for healthcare-themed styling with animations
     st.markdown("""
     <style>
@@ -886,13 +872,8 @@ def render_risk_assessment_view(user):
         # Privacy reminder
         st.info("🔒 Prediction results are stored anonymously for system analytics. No patient identifiers are saved.")
         
-        # Render input form
-        patient_data = render_complete_form()
-        
-        st.divider()
-        
-        # Predict button
-        predict_clicked = st.button("🔍 Analyze Risk", type="primary", use_container_width=True)
+        # Render input form (widgets are batched; reruns only on submit)
+        patient_data, predict_clicked = render_complete_form()
     
     with col_result:
         st.header("📊 Risk Assessment")
@@ -933,7 +914,7 @@ def render_risk_assessment_view(user):
                             try:
                                 log_prediction(
                                     user=user.username,
-                                    user_role=user.role.value,
+                                    user_role=user.role.name.lower(),
                                     risk_level=assessment.risk_label,
                                     risk_probability=float(max(probabilities)) if len(probabilities) > 0 else 0,
                                     alert_generated=assessment.should_alert,
@@ -1175,7 +1156,7 @@ def render_fhir_import_view():
                     assessment = multi_engine.predict_all_risks(patient_data)
                     
                     st.divider()
-                    render_multi_risk_dashboard(assessment)
+                    render_multi_risk_dashboard(assessment, key="fhir_multi_risk")
                 except Exception as e:
                     st.error(f"Analysis error: {e}")
 
@@ -5,10 +5,7 @@ Provides validation functions for patient data input.
 """
 
 from typing import Dict, List, Tuple
-import sys
-from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from cdss_config import SYMPTOMS_LIST, VITAL_SIGNS, EXISTING_CONDITIONS
 
 
@@ -21,6 +18,50 @@ def validate_age(age: int) -> Tuple[bool, str]:
     return True, ""
 
 
+# Vital sign checks in evaluation order: (key, predicate, message, blocking).
+# A blocking rule that fires rejects the vitals with just its message;
+# other rules add a warning formatted with the value as {v}.
+_VITAL_DEFAULTS = {
+    'heart_rate': 75,
+    'blood_pressure_systolic': 120,
+    'blood_pressure_diastolic': 80,
+    'temperature': 37.0,
+    'oxygen_saturation': 98,
+    'respiratory_rate': 16,
+}
+
+_VITAL_RULES = (
+    ('heart_rate', lambda v: v < 30 or v > 220,
+     "Heart rate is outside valid range (30-220 bpm)", True),
+    ('heart_rate', lambda v: v < 50 or v > 120,
+     "⚠️ Heart rate ({v} bpm) is outside normal range (60-100 bpm)", False),
+    ('pulse_pressure', lambda v: v < 0,
+     "Systolic BP must be greater than diastolic BP", True),
+    ('blood_pressure_systolic', lambda v: v > 180 or v < 80,
+     "⚠️ Systolic BP ({v} mmHg) is significantly abnormal", False),
+    ('blood_pressure_diastolic', lambda v: v > 120 or v < 50,
+     "⚠️ Diastolic BP ({v} mmHg) is significantly abnormal", False),
+    ('temperature', lambda v: v < 34 or v > 42,
+     "Temperature is outside valid range (34-42°C)", True),
+    ('temperature', lambda v: v > 38.0,
+     "⚠️ Elevated temperature ({v}°C) indicates fever", False),
+    ('temperature', lambda v: v < 36.0,
+     "⚠️ Low temperature ({v}°C) - hypothermia risk", False),
+    ('oxygen_saturation', lambda v: v < 70 or v > 100,
+     "Oxygen saturation is outside valid range (70-100%)", True),
+    ('oxygen_saturation', lambda v: v < 92,
+     "🚨 Critical: Low oxygen saturation ({v}%)", False),
+    ('oxygen_saturation', lambda v: 92 <= v < 95,
+     "⚠️ Low oxygen saturation ({v}%)", False),
+    ('respiratory_rate', lambda v: v < 6 or v > 50,
+     "Respiratory rate is outside valid range (6-50 breaths/min)", True),
+    ('respiratory_rate', lambda v: v > 25,
+     "⚠️ Elevated respiratory rate ({v} breaths/min)", False),
+    ('respiratory_rate', lambda v: v < 10,
+     "⚠️ Low respiratory rate ({v} breaths/min)", False),
+)
+
+
 def validate_vital_signs(vitals: Dict) -> Tuple[bool, List[str]]:
     """
     Validate vital signs values.
@@ -28,54 +69,16 @@ def validate_vital_signs(vitals: Dict) -> Tuple[bool, List[str]]:
     Returns:
         Tuple of (all_valid, list of warning messages)
     """
-    warnings = []
-    
-    # Heart rate checks
-    hr = vitals.get('heart_rate', 75)
-    if hr < 30 or hr > 220:
-        return False, ["Heart rate is outside valid range (30-220 bpm)"]
-    if hr < 50 or hr > 120:
-        warnings.append(f"⚠️ Heart rate ({hr} bpm) is outside normal range (60-100 bpm)")
-    
-    # Blood pressure checks
-    sys_bp = vitals.get('blood_pressure_systolic', 120)
-    dia_bp = vitals.get('blood_pressure_diastolic', 80)
+    values = {**_VITAL_DEFAULTS, **vitals}
+    values['pulse_pressure'] = values['blood_pressure_systolic'] - values['blood_pressure_diastolic']
     
-    if sys_bp < dia_bp:
-        return False, ["Systolic BP must be greater than diastolic BP"]
-    
-    if sys_bp > 180 or sys_bp < 80:
-        warnings.append(f"⚠️ Systolic BP ({sys_bp} mmHg) is significantly abnormal")
-    
-    if dia_bp > 120 or dia_bp < 50:
-        warnings.append(f"⚠️ Diastolic BP ({dia_bp} mmHg) is significantly abnormal")
-    
-    # Temperature checks
-    temp = vitals.get('temperature', 37.0)
-    if temp < 34 or temp > 42:
-        return False, ["Temperature is outside valid range (34-42°C)"]
-    if temp > 38.0:
-        warnings.append(f"⚠️ Elevated temperature ({temp}°C) indicates fever")
-    if temp < 36.0:
-        warnings.append(f"⚠️ Low temperature ({temp}°C) - hypothermia risk")
-    
-    # Oxygen saturation checks
-    spo2 = vitals.get('oxygen_saturation', 98)
-    if spo2 < 70 or spo2 > 100:
-        return False, ["Oxygen saturation is outside valid range (70-100%)"]
-    if spo2 < 92:
-        warnings.append(f"🚨 Critical: Low oxygen saturation ({spo2}%)")
-    elif spo2 < 95:
-        warnings.append(f"⚠️ Low oxygen saturation ({spo2}%)")
-    
-    # Respiratory rate checks
-    rr = vitals.get('respiratory_rate', 16)
-    if rr < 6 or rr > 50:
-        return False, ["Respiratory rate is outside valid range (6-50 breaths/min)"]
-    if rr > 25:
-        warnings.append(f"⚠️ Elevated respiratory rate ({rr} breaths/min)")
-    if rr < 10:
-        warnings.append(f"⚠️ Low respiratory rate ({rr} breaths/min)")
+    warnings = []
+    for key, predicate, message, blocking in _VITAL_RULES:
+        value = values[key]
+        if predicate(value):
+            if blocking:
+                return False, [message]
+            warnings.append(message.format(v=value))
     
     return True, warnings
 
@@ -0,0 +1,100 @@
+"""
+Tests for Authentication Module
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import auth
+from app.auth import (
+    authenticate,
+    hash_password,
+    User,
+    UserRole,
+    CAN_PREDICT,
+    CAN_VIEW_LOGS
+)
+
+
+class TestAuthenticate:
+    """Test cases for authenticate()."""
+    
+    @pytest.mark.parametrize("username,password,name,role", [
+        ("doctor1", "doctor123", "Dr. Sarah Smith", UserRole.DOCTOR),
+        ("doctor2", "doctor123", "Dr. James Wilson", UserRole.DOCTOR),
+        ("pharmacist1", "pharma123", "John Doe, PharmD", UserRole.PHARMACIST),
+        ("pharmacist2", "pharma123", "Emily Chen, PharmD", UserRole.PHARMACIST),
+        ("admin", "admin123", "System Administrator", UserRole.ADMIN),
+    ])
+    def test_valid_credentials(self, username, password, name, role):
+        """Test that each demo user logs in with their own name and role."""
+        success, user = authenticate(username, password)
+        
+        assert success is True
+        assert user.username == username
+        assert user.name == name
+        assert user.role == role
+    
+    def test_wrong_password(self):
+        """Test that a wrong password is rejected."""
+        assert authenticate("doctor1", "pharma123") == (False, None)
+    
+    def test_unknown_user(self):
+        """Test that an unknown username is rejected."""
+        assert authenticate("nobody", "doctor123") == (False, None)
+    
+    def test_unknown_user_with_dummy_hash_password(self):
+        """Test that the dummy hash's source text cannot log in an unknown user."""
+        assert authenticate("nobody", "no-such-user") == (False, None)
+    
+    def test_comparison_is_constant_time(self, monkeypatch):
+        """Test that known and unknown users both go through hmac.compare_digest."""
+        calls = []
+        real_compare = auth.hmac.compare_digest
+        
+        def spy(a, b):
+            calls.append((a, b))
+            return real_compare(a, b)
+        
+        monkeypatch.setattr(auth.hmac, "compare_digest", spy)
+        
+        authenticate("doctor1", "wrong")
+        authenticate("nobody", "wrong")
+        
+        assert calls == [
+            (hash_password("wrong"), hash_password("doctor123")),
+            (hash_password("wrong"), auth._DUMMY_HASH),
+        ]
+    
+    def test_hash_password_digest(self):
+        """Test that hash_password returns a raw SHA-256 digest."""
+        digest = hash_password("doctor123")
+        
+        assert isinstance(digest, bytes)
+        assert len(digest) == 32
+        assert digest == hash_password("doctor123")
+
+
+class TestUserRole:
+    """Test cases for the role permission masks."""
+    
+    @pytest.mark.parametrize("role,admin,logs,predict", [
+        (UserRole.DOCTOR, False, False, True),
+        (UserRole.PHARMACIST, False, False, True),
+        (UserRole.ADMIN, True, True, True),
+    ])
+    def test_permissions(self, role, admin, logs, predict):
+        """Test the permission helpers for each role."""
+        user = User(username="u", name="User", role=role)
+        
+        assert user.is_admin() is admin
+        assert user.can_view_logs() is logs
+        assert user.can_make_predictions() is predict
+    
+    def test_masks(self):
+        """Test the permission masks cover the expected roles."""
+        assert CAN_PREDICT == UserRole.DOCTOR | UserRole.PHARMACIST | UserRole.ADMIN
+        assert CAN_VIEW_LOGS == UserRole.ADMIN
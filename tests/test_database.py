@@ -0,0 +1,246 @@
+"""
+Tests for Database Module (SQLite backend)
+"""
+
+import pytest
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import db
+
+pytestmark = pytest.mark.skipif(db.USE_POSTGRES, reason="SQLite-only tests")
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Point the module at a fresh SQLite file for the duration of a test."""
+    monkeypatch.setattr(db, 'DB_PATH', tmp_path / "cdss.db")
+    previous = getattr(db._local, 'connection', None)
+    db._local.connection = None
+    db.init_db()
+    yield db
+    db._local.connection.close()
+    db._local.connection = previous
+
+
+@pytest.fixture
+def populated_db(temp_db):
+    """Database with predictions at known timestamps."""
+    _insert_prediction('Low', '2024-01-01 08:00:00', patient_id='P1', heart_rate=70)
+    _insert_prediction('High', '2024-01-02 09:30:45', patient_id='P2', heart_rate=130)
+    _insert_prediction('High', '2024-01-03 10:15:00', patient_id='P3', heart_rate=None)
+    return temp_db
+
+
+def _insert_prediction(risk_level, timestamp=None, **fields):
+    """Insert a minimal prediction row, optionally with an explicit timestamp."""
+    row = {'user_name': 'doctor1', 'risk_level': risk_level, 'risk_probability': 0.5, **fields}
+    if timestamp is not None:
+        row['timestamp'] = timestamp
+    columns = ', '.join(row)
+    placeholders = ', '.join('?' for _ in row)
+    with db.get_db_cursor() as cursor:
+        cursor.execute(f"INSERT INTO predictions ({columns}) VALUES ({placeholders})", list(row.values()))
+        return cursor.lastrowid
+
+
+def _summary():
+    """Current stats_summary contents as metric -> count."""
+    with db.get_db_cursor() as cursor:
+        cursor.execute("SELECT metric, count FROM stats_summary")
+        return {row['metric']: row['count'] for row in cursor.fetchall()}
+
+
+class TestStatsSummary:
+    """Test cases for the trigger-maintained stats_summary table."""
+    
+    def test_empty_database(self, temp_db):
+        """Test that a new database starts with zero totals."""
+        assert _summary() == {'predictions': 0, 'alerts': 0}
+        stats = db.get_statistics()
+        assert stats['total_predictions'] == 0
+        assert stats['total_alerts'] == 0
+        assert stats['risk_distribution'] == {}
+        assert stats['high_risk_rate'] == 0
+    
+    def test_insert_triggers(self, temp_db):
+        """Test that inserts update the totals and the per-risk counts."""
+        db.save_prediction('doctor1', 'doctor', 'High', 0.9, True, 'critical', {'heart_rate': 130}, 2, 1)
+        db.save_prediction('doctor1', 'doctor', 'High', 0.8, True, 'critical', {'heart_rate': 125}, 1, 0)
+        db.save_prediction('doctor2', 'doctor', 'Low', 0.2, False, None, {'heart_rate': 72}, 0, 0)
+        db.save_alert('doctor1', 'High', 'Critical risk', ['Review now'])
+        
+        assert _summary() == {'predictions': 3, 'alerts': 1, 'risk:High': 2, 'risk:Low': 1}
+    
+    def test_delete_triggers(self, temp_db):
+        """Test that deletes decrement the counts and empty levels drop out of the distribution."""
+        high_id = _insert_prediction('High')
+        _insert_prediction('Medium')
+        
+        with db.get_db_cursor() as cursor:
+            cursor.execute("DELETE FROM predictions WHERE id = ?", (high_id,))
+        
+        assert _summary()['predictions'] == 1
+        assert _summary()['risk:High'] == 0
+        assert db.get_statistics()['risk_distribution'] == {'Medium': 1}
+    
+    def test_alert_delete_trigger(self, temp_db):
+        """Test that deleting an alert decrements the alert total."""
+        alert_id = db.save_alert('doctor1', 'High', 'Critical risk', [])
+        
+        with db.get_db_cursor() as cursor:
+            cursor.execute("DELETE FROM alerts WHERE id = ?", (alert_id,))
+        
+        assert _summary()['alerts'] == 0
+    
+    def test_backfill(self, temp_db):
+        """Test that a database without summary rows is backfilled from the source tables."""
+        _insert_prediction('High')
+        _insert_prediction('Low')
+        _insert_prediction('Low')
+        db.save_alert('doctor1', 'High', 'Critical risk', [])
+        
+        with db.get_db_cursor() as cursor:
+            cursor.execute("DELETE FROM stats_summary")
+        db.init_db()
+        
+        assert _summary() == {'predictions': 3, 'alerts': 1, 'risk:High': 1, 'risk:Low': 2}
+    
+    def test_reinit_does_not_double_count(self, temp_db):
+        """Test that init_db on a populated database leaves the summary unchanged."""
+        _insert_prediction('High')
+        before = _summary()
+        
+        db.init_db()
+        
+        assert _summary() == before
+    
+    def test_statistics(self, temp_db):
+        """Test totals, rates and the today/week counts."""
+        now = datetime.now()
+        _insert_prediction('High', now.strftime('%Y-%m-%d %H:%M:%S'))
+        _insert_prediction('Low', (now - timedelta(days=3)).strftime('%Y-%m-%d %H:%M:%S'))
+        _insert_prediction('Low', (now - timedelta(days=10)).strftime('%Y-%m-%d %H:%M:%S'))
+        _insert_prediction('Medium', (now - timedelta(days=30)).strftime('%Y-%m-%d %H:%M:%S'))
+        db.save_alert('doctor1', 'High', 'Critical risk', [])
+        
+        stats = db.get_statistics()
+        
+        assert stats['total_predictions'] == 4
+        assert stats['total_alerts'] == 1
+        assert stats['today_predictions'] == 1
+        assert stats['week_predictions'] == 2
+        assert stats['risk_distribution'] == {'High': 1, 'Low': 2, 'Medium': 1}
+        assert stats['high_risk_rate'] == 25.0
+        assert stats['alert_rate'] == 25.0
+
+
+class TestColumnSelection:
+    """Test cases for get_predictions with an explicit column list."""
+    
+    COLUMNS = ('timestamp', 'patient_id', 'risk_level', 'risk_probability', 'heart_rate')
+    
+    def test_selects_requested_columns(self, populated_db):
+        """Test that only the requested columns come back, newest first."""
+        rows = db.get_predictions(limit=10, columns=self.COLUMNS)
+        
+        assert [list(row) for row in rows] == [list(self.COLUMNS)] * 3
+        assert [row['patient_id'] for row in rows] == ['P3', 'P2', 'P1']
+        assert rows[0]['heart_rate'] is None
+    
+    def test_unknown_column(self, temp_db):
+        """Test that columns outside the whitelist are rejected."""
+        with pytest.raises(ValueError):
+            db.get_predictions(columns=('risk_level', 'password'))
+        with pytest.raises(ValueError):
+            db.get_predictions(columns=('risk_level FROM predictions; DROP TABLE predictions; --',))
+
+
+class TestColumnarQueries:
+    """Test cases for the column-oriented prediction and alert getters."""
+    
+    COLUMNS = ('timestamp', 'patient_id', 'risk_level', 'risk_probability', 'heart_rate')
+    
+    def test_matches_row_oriented(self, populated_db):
+        """Test that the columnar result is the transpose of get_predictions."""
+        rows = db.get_predictions(limit=10, columns=self.COLUMNS)
+        columns = db.get_predictions_columnar(limit=10, columns=self.COLUMNS)
+        
+        assert list(columns) == list(self.COLUMNS)
+        assert columns == {name: [row[name] for row in rows] for name in self.COLUMNS}
+        assert columns['patient_id'] == ['P3', 'P2', 'P1']
+    
+    def test_filters_and_limit(self, populated_db):
+        """Test the risk filter, date range and limit."""
+        high = db.get_predictions_columnar(risk_level='High', columns=('patient_id',))
+        assert high == {'patient_id': ['P3', 'P2']}
+        
+        limited = db.get_predictions_columnar(limit=1, columns=('patient_id',))
+        assert limited == {'patient_id': ['P3']}
+        
+        ranged = db.get_predictions_columnar(
+            start_date='2024-01-02', end_date='2024-01-02 23:59:59', columns=('patient_id',)
+        )
+        assert ranged == {'patient_id': ['P2']}
+    
+    def test_empty_result_keeps_columns(self, temp_db):
+        """Test that an empty table still returns every requested column."""
+        assert db.get_predictions_columnar(columns=self.COLUMNS) == {name: [] for name in self.COLUMNS}
+    
+    def test_alerts_columnar(self, temp_db):
+        """Test that alerts come back column-wise with recommendations left as JSON text."""
+        db.save_alert('doctor1', 'High', 'First', ['Check vitals'])
+        db.save_alert('doctor1', 'Medium', 'Second', ['Recheck', 'Monitor'])
+        
+        rows = db.get_alerts(limit=10)
+        columns = db.get_alerts_columnar(limit=10, columns=('alert_message', 'recommendations'))
+        
+        assert columns['alert_message'] == [row['alert_message'] for row in rows]
+        assert sorted(columns['alert_message']) == ['First', 'Second']
+        decoded = {row['alert_message']: row['recommendations'] for row in rows}
+        assert decoded['Second'] == ['Recheck', 'Monitor']
+        assert all(isinstance(value, str) for value in columns['recommendations'])
+    
+    def test_unknown_alert_column(self, temp_db):
+        """Test that alert columns outside the whitelist are rejected."""
+        with pytest.raises(ValueError):
+            db.get_alerts_columnar(columns=('alert_message; DROP TABLE alerts',))
+    
+    def test_format_timestamp(self, populated_db):
+        """Test that timestamps are formatted to minutes in SQL and ordering is preserved."""
+        columns = db.get_predictions_columnar(
+            columns=('timestamp', 'patient_id'), format_timestamp=True
+        )
+        
+        assert columns['timestamp'] == ['2024-01-03 10:15', '2024-01-02 09:30', '2024-01-01 08:00']
+        assert columns['patient_id'] == ['P3', 'P2', 'P1']
+    
+    def test_format_alert_timestamp(self, temp_db):
+        """Test that alert timestamps are formatted the same way."""
+        alert_id = db.save_alert('doctor1', 'High', 'First', [])
+        with db.get_db_cursor() as cursor:
+            cursor.execute("UPDATE alerts SET timestamp = '2024-01-02 09:30:45' WHERE id = ?", (alert_id,))
+        
+        columns = db.get_alerts_columnar(columns=('timestamp',), format_timestamp=True)
+        
+        assert columns == {'timestamp': ['2024-01-02 09:30']}
+
+
+class TestRecordMetadata:
+    """Test cases for get_total_records and get_latest_timestamp."""
+    
+    def test_empty(self, temp_db):
+        """Test an empty database."""
+        assert db.get_total_records() == 0
+        assert db.get_latest_timestamp() is None
+    
+    def test_latest_timestamp(self, temp_db):
+        """Test that the latest timestamp is the maximum, not the last inserted."""
+        _insert_prediction('Low', '2024-03-05 12:00:00')
+        _insert_prediction('Low', '2024-01-01 00:00:00')
+        
+        assert db.get_total_records() == 2
+        assert db.get_latest_timestamp() == '2024-03-05 12:00:00'
@@ -0,0 +1,70 @@
+"""
+Tests for Input Form Component
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.components.input_form import get_vital_status
+from cdss_config import EXTENDED_VITAL_SIGNS
+
+NORMAL = ("🟢", "Normal", "green")
+ABNORMAL = ("🟡", "Abnormal", "orange")
+WARNING_LOW = ("🟡", "Warning (Low)", "orange")
+WARNING_HIGH = ("🟡", "Warning (High)", "orange")
+CRITICAL_LOW = ("🔴", "Critical (Low)", "red")
+CRITICAL_HIGH = ("🔴", "Critical (High)", "red")
+
+
+class TestGetVitalStatus:
+    """Test cases for get_vital_status."""
+    
+    @pytest.mark.parametrize("name,value,expected", [
+        ('blood_sugar', 40, CRITICAL_LOW),
+        ('blood_sugar', 50, CRITICAL_LOW),
+        ('blood_sugar', 55, WARNING_LOW),
+        ('blood_sugar', 60, WARNING_LOW),
+        ('blood_sugar', 65, ABNORMAL),
+        ('blood_sugar', 70, NORMAL),
+        ('blood_sugar', 100, NORMAL),
+        ('blood_sugar', 110, ABNORMAL),
+        ('blood_sugar', 125, WARNING_HIGH),
+        ('blood_sugar', 200, CRITICAL_HIGH),
+        ('bmi', 15, CRITICAL_LOW),
+        ('bmi', 16, WARNING_LOW),
+        ('bmi', 17, ABNORMAL),
+        ('bmi', 18.5, NORMAL),
+        ('bmi', 24.9, NORMAL),
+        ('bmi', 27, ABNORMAL),
+        ('bmi', 30, WARNING_HIGH),
+        ('bmi', 40, CRITICAL_HIGH),
+        ('pain_score', 0, NORMAL),
+        ('pain_score', 3, NORMAL),
+        ('pain_score', 4, ABNORMAL),
+        ('pain_score', 6, WARNING_HIGH),
+        ('pain_score', 8, CRITICAL_HIGH),
+        ('pain_score', 10, CRITICAL_HIGH),
+        ('consciousness_gcs', 3, CRITICAL_LOW),
+        ('consciousness_gcs', 8, CRITICAL_LOW),
+        ('consciousness_gcs', 9, WARNING_LOW),
+        ('consciousness_gcs', 13, WARNING_LOW),
+        ('consciousness_gcs', 14, ABNORMAL),
+        ('consciousness_gcs', 15, NORMAL),
+    ])
+    def test_extended_vitals(self, name, value, expected):
+        """Test the status at and between each extended vital's thresholds."""
+        assert get_vital_status(value, EXTENDED_VITAL_SIGNS[name]) == expected
+    
+    def test_repeated_lookup(self):
+        """Test that repeated lookups of the same value give the same status."""
+        config = EXTENDED_VITAL_SIGNS['bmi']
+        
+        assert get_vital_status(31.2, config) == WARNING_HIGH
+        assert get_vital_status(31.2, config) == WARNING_HIGH
+    
+    def test_config_without_bounds_is_normal(self):
+        """Test that a config with no thresholds reports every value as normal."""
+        assert get_vital_status(42, {'label': 'Any'}) == NORMAL
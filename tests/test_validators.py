@@ -0,0 +1,108 @@
+"""
+Tests for Input Validation Utilities
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.validators import validate_patient_data
+
+
+def make_patient(**vitals):
+    """Patient with normal vitals, overridden by the given values."""
+    patient = {
+        'age': 45,
+        'gender': 'female',
+        'heart_rate': 75,
+        'blood_pressure_systolic': 120,
+        'blood_pressure_diastolic': 80,
+        'temperature': 37.0,
+        'oxygen_saturation': 98,
+        'respiratory_rate': 16
+    }
+    patient.update(vitals)
+    return patient
+
+
+class TestVitalSignValidation:
+    """Test cases for the vital sign checks in validate_patient_data."""
+    
+    def test_normal_vitals(self):
+        """Test that normal vitals pass without messages."""
+        assert validate_patient_data(make_patient()) == (True, [], [])
+    
+    def test_missing_vitals_use_defaults(self):
+        """Test that omitted vitals fall back to normal defaults."""
+        assert validate_patient_data({'age': 45, 'gender': 'male'}) == (True, [], [])
+    
+    @pytest.mark.parametrize("vitals,error", [
+        ({'heart_rate': 29}, "Heart rate is outside valid range (30-220 bpm)"),
+        ({'heart_rate': 221}, "Heart rate is outside valid range (30-220 bpm)"),
+        ({'blood_pressure_systolic': 79, 'blood_pressure_diastolic': 80},
+         "Systolic BP must be greater than diastolic BP"),
+        ({'temperature': 33.9}, "Temperature is outside valid range (34-42°C)"),
+        ({'temperature': 42.1}, "Temperature is outside valid range (34-42°C)"),
+        ({'oxygen_saturation': 69}, "Oxygen saturation is outside valid range (70-100%)"),
+        ({'oxygen_saturation': 101}, "Oxygen saturation is outside valid range (70-100%)"),
+        ({'respiratory_rate': 5}, "Respiratory rate is outside valid range (6-50 breaths/min)"),
+        ({'respiratory_rate': 51}, "Respiratory rate is outside valid range (6-50 breaths/min)"),
+    ])
+    def test_out_of_range_is_error(self, vitals, error):
+        """Test that values outside the valid range are rejected."""
+        assert validate_patient_data(make_patient(**vitals)) == (False, [error], [])
+    
+    @pytest.mark.parametrize("vitals,warning", [
+        ({'heart_rate': 30}, "⚠️ Heart rate (30 bpm) is outside normal range (60-100 bpm)"),
+        ({'heart_rate': 49}, "⚠️ Heart rate (49 bpm) is outside normal range (60-100 bpm)"),
+        ({'heart_rate': 121}, "⚠️ Heart rate (121 bpm) is outside normal range (60-100 bpm)"),
+        ({'blood_pressure_systolic': 181}, "⚠️ Systolic BP (181 mmHg) is significantly abnormal"),
+        ({'blood_pressure_systolic': 79, 'blood_pressure_diastolic': 60},
+         "⚠️ Systolic BP (79 mmHg) is significantly abnormal"),
+        ({'blood_pressure_diastolic': 49}, "⚠️ Diastolic BP (49 mmHg) is significantly abnormal"),
+        ({'blood_pressure_systolic': 150, 'blood_pressure_diastolic': 121},
+         "⚠️ Diastolic BP (121 mmHg) is significantly abnormal"),
+        ({'temperature': 38.1}, "⚠️ Elevated temperature (38.1°C) indicates fever"),
+        ({'temperature': 35.9}, "⚠️ Low temperature (35.9°C) - hypothermia risk"),
+        ({'oxygen_saturation': 91}, "🚨 Critical: Low oxygen saturation (91%)"),
+        ({'oxygen_saturation': 92}, "⚠️ Low oxygen saturation (92%)"),
+        ({'oxygen_saturation': 94.5}, "⚠️ Low oxygen saturation (94.5%)"),
+        ({'respiratory_rate': 26}, "⚠️ Elevated respiratory rate (26 breaths/min)"),
+        ({'respiratory_rate': 9}, "⚠️ Low respiratory rate (9 breaths/min)"),
+    ])
+    def test_abnormal_is_warning(self, vitals, warning):
+        """Test that abnormal but valid values produce a single warning."""
+        assert validate_patient_data(make_patient(**vitals)) == (True, [], [warning])
+    
+    @pytest.mark.parametrize("vitals", [
+        {'heart_rate': 50}, {'heart_rate': 120},
+        {'blood_pressure_systolic': 80, 'blood_pressure_diastolic': 50},
+        {'blood_pressure_systolic': 180, 'blood_pressure_diastolic': 120},
+        {'temperature': 36.0}, {'temperature': 38.0},
+        {'oxygen_saturation': 95}, {'oxygen_saturation': 100},
+        {'respiratory_rate': 10}, {'respiratory_rate': 25},
+    ])
+    def test_threshold_values_are_normal(self, vitals):
+        """Test that values exactly on a normal-range threshold pass without messages."""
+        assert validate_patient_data(make_patient(**vitals)) == (True, [], [])
+    
+    def test_warnings_follow_rule_order(self):
+        """Test that several warnings are reported in vital order."""
+        patient = make_patient(heart_rate=130, temperature=38.5, oxygen_saturation=93, respiratory_rate=28)
+        
+        assert validate_patient_data(patient) == (True, [], [
+            "⚠️ Heart rate (130 bpm) is outside normal range (60-100 bpm)",
+            "⚠️ Elevated temperature (38.5°C) indicates fever",
+            "⚠️ Low oxygen saturation (93%)",
+            "⚠️ Elevated respiratory rate (28 breaths/min)",
+        ])
+    
+    def test_error_discards_earlier_warnings(self):
+        """Test that an out-of-range value reports only its error."""
+        patient = make_patient(heart_rate=130, temperature=45)
+        
+        assert validate_patient_data(patient) == (
+            False, ["Temperature is outside valid range (34-42°C)"], []
+        )